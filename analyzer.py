@@ -16,7 +16,7 @@ from database import MemecoinDatabase
 from data_fetcher import MemecoinDataFetcher
 from display import (
     display_analysis, format_currency, get_safety_rating, get_tier_emoji,
-    print_header, print_menu,
+    print_header, print_menu, sign_emoji,
     TIER_EMOJI, DEFAULT_TIER_EMOJI, SAFETY_THRESHOLDS,
     HONEYPOT_EMOJI, PRESSURE_EMOJI, MOMENTUM_EMOJI, VOLUME_EMOJI, CONCENTRATION_EMOJI,
 )
@@ -186,17 +186,16 @@ class MemecoinAnalyzer:
         token_name = data.get('token_name') or "Unknown"
         token_symbol = data.get('token_symbol') or "Unknown"
 
-        # Insert call to database
-        call_id = self.db.insert_call(
-            contract_address=contract_address,
-            token_symbol=token_symbol,
-            token_name=token_name,
-            source=source,
-            blockchain=blockchain
-        )
-
-        # Insert snapshot
-        self.db.insert_snapshot(call_id, data)
+        # Insert call and snapshot together (one commit)
+        with self.db.transaction():
+            call_id = self.db.insert_call(
+                contract_address=contract_address,
+                token_symbol=token_symbol,
+                token_name=token_name,
+                source=source,
+                blockchain=blockchain
+            )
+            self.db.insert_snapshot(call_id, data)
 
         # Display analysis
         display_analysis(token_symbol, token_name, source, data)
@@ -206,8 +205,7 @@ class MemecoinAnalyzer:
 
         # Update source performance for all sources
         sources = [self.db.normalize_source_name(s) for s in source.split(',')]
-        for src in sources:
-            self.db.update_source_performance(src)
+        self.db.update_source_performance_bulk(sources)
 
         print(f"\n✅ Saved to database (Call ID: {call_id})")
 
@@ -292,40 +290,41 @@ class MemecoinAnalyzer:
         except ValueError:
             confidence_level = 5
 
-        # Save decision to database
-        self.db.insert_decision(
-            call_id=call_id,
-            decision=decision,
-            trade_size_usd=trade_size_usd,
-            entry_price=entry_price,
-            reasoning_notes=reasoning_notes,
-            emotional_state=emotional_state,
-            confidence_level=confidence_level,
-            chart_assessment=chart_assessment,
-            entry_timestamp=entry_timestamp
-        )
-
-        # Insert initial history checkpoint at call/decision time so tracking starts immediately.
-        # For TRADE the baseline is entry_price; for WATCH it's call_price.
-        # The first checkpoint is always 0% gain since we just entered.
-        reference_price = entry_price if decision == 'TRADE' else call_price
-        observed_price = entry_price if decision == 'TRADE' else call_price
-        initial_gain_loss = 0.0 if reference_price else None
-
-        self.db.insert_performance_history(call_id, {
-            'decision_status': decision,
-            'reference_price': reference_price,
-            'price_usd': observed_price,
-            'liquidity_usd': data.get('liquidity_usd'),
-            'total_liquidity': data.get('total_liquidity') or data.get('liquidity_usd'),
-            'market_cap': data.get('market_cap'),
-            'gain_loss_pct': initial_gain_loss,
-            'price_change_pct': None,
-            'liquidity_change_pct': None,
-            'market_cap_change_pct': None,
-            'token_still_alive': 'yes' if observed_price else 'unknown',
-            'rug_pull_occurred': None
-        })
+        # Save decision and its first history checkpoint in one commit
+        with self.db.transaction():
+            self.db.insert_decision(
+                call_id=call_id,
+                decision=decision,
+                trade_size_usd=trade_size_usd,
+                entry_price=entry_price,
+                reasoning_notes=reasoning_notes,
+                emotional_state=emotional_state,
+                confidence_level=confidence_level,
+                chart_assessment=chart_assessment,
+                entry_timestamp=entry_timestamp
+            )
+
+            # Insert initial history checkpoint at call/decision time so tracking starts immediately.
+            # For TRADE the baseline is entry_price; for WATCH it's call_price.
+            # The first checkpoint is always 0% gain since we just entered.
+            reference_price = entry_price if decision == 'TRADE' else call_price
+            observed_price = entry_price if decision == 'TRADE' else call_price
+            initial_gain_loss = 0.0 if reference_price else None
+
+            self.db.insert_performance_history(call_id, {
+                'decision_status': decision,
+                'reference_price': reference_price,
+                'price_usd': observed_price,
+                'liquidity_usd': data.get('liquidity_usd'),
+                'total_liquidity': data.get('total_liquidity') or data.get('liquidity_usd'),
+                'market_cap': data.get('market_cap'),
+                'gain_loss_pct': initial_gain_loss,
+                'price_change_pct': None,
+                'liquidity_change_pct': None,
+                'market_cap_change_pct': None,
+                'token_still_alive': 'yes' if observed_price else 'unknown',
+                'rug_pull_occurred': None
+            })
 
     def view_source_stats(self) -> None:
         """Display statistics for all tracked sources."""
@@ -397,7 +396,7 @@ class MemecoinAnalyzer:
 
         # Query all WATCH decisions with token data
         try:
-            self.db.cursor.execute('''
+            watchlist = self.db._query('''
                 SELECT
                     c.call_id,
                     c.token_symbol,
@@ -444,7 +443,7 @@ class MemecoinAnalyzer:
             ''')
         except Exception as e:
             logger.warning("performance_history unavailable, using tracked snapshot only", error=str(e))
-            self.db.cursor.execute('''
+            watchlist = self.db._query('''
                 SELECT
                     c.call_id,
                     c.token_symbol,
@@ -476,8 +475,6 @@ class MemecoinAnalyzer:
                 ORDER BY d.timestamp_decision DESC
             ''')
 
-        watchlist = [dict(row) for row in self.db.cursor.fetchall()]
-
         if not watchlist:
             print("\n⚠️  Your watchlist is empty. Mark tokens as WATCH to track them!")
             return
@@ -503,12 +500,12 @@ class MemecoinAnalyzer:
                             name = birdeye_raw.get('name')
                             symbol = birdeye_raw.get('symbol')
                         if name or symbol:
-                            self.db._execute('''
-                                UPDATE calls_received
-                                SET token_symbol = ?, token_name = ?
-                                WHERE call_id = ?
-                            ''', (symbol or token.get('token_symbol'), name or token.get('token_name'), token['call_id']))
-                            self.db.conn.commit()
+                            with self.db.transaction():
+                                self.db._execute('''
+                                    UPDATE calls_received
+                                    SET token_symbol = ?, token_name = ?
+                                    WHERE call_id = ?
+                                ''', (symbol or token.get('token_symbol'), name or token.get('token_name'), token['call_id']))
                             token['token_symbol'] = symbol or token.get('token_symbol')
                             token['token_name'] = name or token.get('token_name')
             # Header for each token
@@ -530,7 +527,7 @@ class MemecoinAnalyzer:
                 print(f"    💰 Initial MCap: {format_currency(initial_mcap)}")
             if current_mcap:
                 mcap_change = ((current_mcap - initial_mcap) / initial_mcap * 100) if initial_mcap else 0
-                mcap_indicator = "📈" if mcap_change > 0 else "📉" if mcap_change < 0 else "➡️"
+                mcap_indicator = sign_emoji(mcap_change)
                 print(f"    {mcap_indicator} Current MCap: {format_currency(current_mcap)} ({mcap_change:+.1f}%)")
 
             # Liquidity tracking
@@ -538,7 +535,7 @@ class MemecoinAnalyzer:
             current_liquidity = token.get('current_liquidity') or token.get('tracked_liquidity')
             if current_liquidity and entry_liquidity:
                 liq_change = ((current_liquidity - entry_liquidity) / entry_liquidity * 100) if entry_liquidity else 0
-                liq_indicator = "📈" if liq_change > 0 else "📉" if liq_change < 0 else "➡️"
+                liq_indicator = sign_emoji(liq_change)
                 print(f"    {liq_indicator} Current Liquidity: {format_currency(current_liquidity)} ({liq_change:+.1f}%)")
 
             # Current price
@@ -546,7 +543,7 @@ class MemecoinAnalyzer:
             if current_price:
                 entry_price = token.get('entry_price') or 0
                 price_change = ((current_price - entry_price) / entry_price * 100) if entry_price else 0
-                price_indicator = "📈" if price_change > 0 else "📉" if price_change < 0 else "➡️"
+                price_indicator = sign_emoji(price_change)
                 print(f"    {price_indicator} Current Price: ${current_price:.10f} ({price_change:+.1f}%)")
 
             # Decision info
@@ -613,7 +610,7 @@ class MemecoinAnalyzer:
                         entry_price = token.get('entry_price') or 0
                         gain_loss = ((live_price - entry_price) / entry_price * 100) if live_price and entry_price else None
                         if live_price and entry_price:
-                            price_indicator = "📈" if gain_loss > 0 else "📉" if gain_loss < 0 else "➡️"
+                            price_indicator = sign_emoji(gain_loss)
                             print(f"    {price_indicator} Live Price: ${live_price:.10f} ({gain_loss:+.1f}%)")
                         if live_mcap:
                             print(f"    💰 Live MCap: {format_currency(live_mcap)}")
@@ -667,7 +664,7 @@ class MemecoinAnalyzer:
         print("="*70)
 
         # Get all TRADE decisions without exit
-        self.db.cursor.execute('''
+        positions = self.db._query('''
             SELECT
                 c.call_id, c.contract_address, c.token_symbol, c.token_name, c.source, c.blockchain,
                 s.price_usd as call_price,
@@ -692,8 +689,6 @@ class MemecoinAnalyzer:
             ORDER BY d.entry_timestamp DESC
         ''')
 
-        positions = [dict(row) for row in self.db.cursor.fetchall()]
-
         if not positions:
             print("\n📭 No open positions. You're all cash!")
             print("💡 Use [1] Analyze new call or [7] Convert WATCH to TRADE to open positions.")
@@ -831,7 +826,7 @@ class MemecoinAnalyzer:
         print("━"*60)
 
         # Get watchlist tokens with performance data
-        self.db.cursor.execute('''
+        watchlist = self.db._query('''
             SELECT
                 c.call_id,
                 c.token_symbol,
@@ -860,8 +855,6 @@ class MemecoinAnalyzer:
             ORDER BY d.timestamp_decision DESC
         ''')
 
-        watchlist = [dict(row) for row in self.db.cursor.fetchall()]
-
         if not watchlist:
             print("\n⚠️  Your watchlist is empty!")
             return
@@ -962,21 +955,21 @@ class MemecoinAnalyzer:
             confidence_level = 5
 
         # Update the decision from WATCH to TRADE with new entry price
-        self.db._execute('''
-            UPDATE my_decisions
-            SET my_decision = 'TRADE',
-                trade_size_usd = ?,
-                entry_price = ?,
-                entry_timestamp = ?,
-                reasoning_notes = ?,
-                emotional_state = ?,
-                confidence_level = ?,
-                chart_assessment = ?
-            WHERE call_id = ? AND my_decision = 'WATCH'
-        ''', (trade_size_usd, entry_price, entry_timestamp, reasoning_notes,
-              emotional_state, confidence_level, chart_assessment, call_id))
-
-        self.db.conn.commit()
+        with self.db.transaction():
+            self.db._execute('''
+                UPDATE my_decisions
+                SET my_decision = 'TRADE',
+                    trade_size_usd = ?,
+                    entry_price = ?,
+                    entry_timestamp = ?,
+                    reasoning_notes = ?,
+                    emotional_state = ?,
+                    confidence_level = ?,
+                    chart_assessment = ?
+                WHERE call_id = ? AND my_decision = 'WATCH'
+            ''', (trade_size_usd, entry_price, entry_timestamp, reasoning_notes,
+                  emotional_state, confidence_level, chart_assessment, call_id))
+
 
         # Insert conversion checkpoint so time-series includes decision transition point.
         checkpoint_price = current_data.get('price_usd') if current_data else entry_price
@@ -1014,7 +1007,7 @@ class MemecoinAnalyzer:
         print("━"*60)
 
         # Get watchlist tokens
-        self.db.cursor.execute('''
+        watchlist = self.db._query('''
             SELECT
                 c.call_id,
                 c.token_symbol,
@@ -1031,8 +1024,6 @@ class MemecoinAnalyzer:
             ORDER BY d.timestamp_decision DESC
         ''')
 
-        watchlist = [dict(row) for row in self.db.cursor.fetchall()]
-
         if not watchlist:
             print("\n⚠️  Your watchlist is empty!")
             return
@@ -1064,12 +1055,12 @@ class MemecoinAnalyzer:
             return
 
         # Change decision from WATCH to PASS
-        self.db._execute('''
-            UPDATE my_decisions
-            SET my_decision = 'PASS'
-            WHERE call_id = ? AND my_decision = 'WATCH'
-        ''', (selected_token['call_id'],))
-        self.db.conn.commit()
+        with self.db.transaction():
+            self.db._execute('''
+                UPDATE my_decisions
+                SET my_decision = 'PASS'
+                WHERE call_id = ? AND my_decision = 'WATCH'
+            ''', (selected_token['call_id'],))
 
         # Insert final watchlist checkpoint at removal time.
         live = self.fetcher.fetch_birdeye_data(
@@ -1277,21 +1268,19 @@ class MemecoinAnalyzer:
 
         # Update database
         updated_source = ', '.join(all_sources)
-        self.db._execute('''
-            UPDATE calls_received
-            SET source = ?
-            WHERE contract_address = ?
-        ''', (updated_source, contract_address))
-        self.db.conn.commit()
+        with self.db.transaction():
+            self.db._execute('''
+                UPDATE calls_received
+                SET source = ?
+                WHERE contract_address = ?
+            ''', (updated_source, contract_address))
 
         print(f"\n✅ Added {added_count} new source(s)")
         print(f"📍 Updated source list: {updated_source}")
 
         # Update source performance for all new sources
         print(f"\n🔄 Updating source performance stats...")
-        for src in new_sources:
-            if src in all_sources:
-                self.db.update_source_performance(src)
+        self.db.update_source_performance_bulk([src for src in new_sources if src in all_sources])
         print("✅ Source stats updated")
 
     def record_exit_trade(self) -> None:
@@ -1354,7 +1343,7 @@ class MemecoinAnalyzer:
         if self.db.record_exit(selected_trade['call_id'], exit_price):
             entry_price = selected_trade['entry_price']
             pnl_percent = ((exit_price - entry_price) / entry_price * 100) if entry_price else 0
-            pnl_indicator = "📈" if pnl_percent > 0 else "📉" if pnl_percent < 0 else "➡️"
+            pnl_indicator = sign_emoji(pnl_percent)
 
             # Insert final trade checkpoint at exit time.
             self.db.insert_performance_history(selected_trade['call_id'], {
@@ -19,6 +19,8 @@ DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "meme
 
 # API Keys
 BIRDEYE_API_KEY = os.environ.get('BIRDEYE_API_KEY')
+# Birdeye requests per second the tracker may make (raise it on paid plans)
+BIRDEYE_RPS = float(os.environ.get('BIRDEYE_RPS', '1'))
 
 # Logging
 LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
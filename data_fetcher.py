@@ -1,7 +1,8 @@
 import random
 import requests
+import threading
 import time
-from datetime import datetime, timedelta
+from datetime import datetime
 from functools import wraps, lru_cache
 from typing import Dict, Any, Optional, List, Callable, TypeVar
 
@@ -20,42 +21,56 @@ T = TypeVar('T')
 # =============================================================================
 
 class TTLCache:
-    """Simple time-to-live cache for API responses."""
+    """Simple time-to-live cache for API responses.
+
+    Thread-safe, and bounded by maxsize: when full, the oldest entry is
+    evicted first (entries are kept in insertion order).
+    """
     
-    def __init__(self, ttl_seconds: int = 60):
+    def __init__(self, ttl_seconds: float = 60, maxsize: int = 4096):
         self.ttl = ttl_seconds
+        self.maxsize = maxsize
         self._cache: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
     
     def get(self, key: str) -> Optional[Dict[str, Any]]:
         """Get cached value if not expired."""
-        if key not in self._cache:
-            return None
-        cached = self._cache[key]
-        if datetime.now() - cached['timestamp'] > timedelta(seconds=self.ttl):
-            del self._cache[key]
-            return None
-        return cached['data']
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is None:
+                return None
+            if time.monotonic() - cached['timestamp'] > self.ttl:
+                del self._cache[key]
+                return None
+            return cached['data']
     
     def set(self, key: str, data: Dict[str, Any]) -> None:
         """Set cached value with timestamp."""
-        self._cache[key] = {
-            'data': data,
-            'timestamp': datetime.now()
-        }
+        with self._lock:
+            # Re-insert so the entry moves to the newest end
+            self._cache.pop(key, None)
+            while len(self._cache) >= self.maxsize:
+                del self._cache[next(iter(self._cache))]
+            self._cache[key] = {
+                'data': data,
+                'timestamp': time.monotonic()
+            }
     
     def clear(self) -> None:
         """Clear all cached values."""
-        self._cache.clear()
+        with self._lock:
+            self._cache.clear()
     
     def cleanup_expired(self) -> int:
         """Remove expired entries and return count cleaned."""
-        now = datetime.now()
-        expired = [
-            k for k, v in self._cache.items()
-            if now - v['timestamp'] > timedelta(seconds=self.ttl)
-        ]
-        for k in expired:
-            del self._cache[k]
+        now = time.monotonic()
+        with self._lock:
+            expired = [
+                k for k, v in self._cache.items()
+                if now - v['timestamp'] > self.ttl
+            ]
+            for k in expired:
+                del self._cache[k]
         return len(expired)
 
 
@@ -68,6 +83,35 @@ def get_api_cache() -> TTLCache:
     return _api_cache
 
 
+# =============================================================================
+# RATE LIMITING - Shared request pacing for concurrent callers
+# =============================================================================
+
+class RateLimiter:
+    """Thread-safe token bucket: rate_per_second sustained, bursts up to burst.
+
+    Tracks the bucket as a theoretical arrival time (GCRA), so acquire()
+    only takes the lock to reserve a slot and sleeps outside it; concurrent
+    workers overlap their request latency while the rate stays capped.
+    """
+
+    def __init__(self, rate_per_second: float, burst: int = 1):
+        self.interval = 1.0 / rate_per_second if rate_per_second > 0 else 0.0
+        self.burst = max(1, burst)
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def acquire(self) -> None:
+        """Block until the bucket has a token for the caller."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+            wait = slot - (self.burst - 1) * self.interval - now
+        if wait > 0:
+            time.sleep(wait)
+
+
 # =============================================================================
 # ERROR CLASSES - Typed errors for better handling
 # =============================================================================
@@ -237,9 +281,15 @@ class MemecoinDataFetcher:
     """Fetches memecoin data from Birdeye and GoPlus (security) APIs."""
 
     BIRDEYE_API = "https://public-api.birdeye.so/defi/token_overview"
+    BIRDEYE_MULTI_PRICE_API = "https://public-api.birdeye.so/defi/multi_price"
+    # Addresses per multi_price request; small sorted chunks repeat across runs
+    # and so hit Birdeye's cache more often than one large list
+    BIRDEYE_MULTI_PRICE_CHUNK = 30
     GOPLUS_EVM_API = "https://api.gopluslabs.io/api/v1/token_security/{chain_id}"
     GOPLUS_SOLANA_API = "https://api.gopluslabs.io/api/v1/solana/token_security"
     DEXSCREENER_API = "https://api.dexscreener.com/latest/dex/tokens"
+    # DexScreener's tokens endpoint takes at most 30 comma-separated addresses
+    DEXSCREENER_BATCH_CHUNK = 30
 
     # Chain configuration: maps chain names to API-specific values
     # goplus_chain_id: EVM numeric chain ID for GoPlus, or 'solana' for Solana
@@ -265,6 +315,12 @@ class MemecoinDataFetcher:
         self.retry_attempts = retry_attempts
         self.max_backoff = max_backoff
         self._api_cache = TTLCache(ttl_seconds=60)  # Instance-level cache
+        # One pooled session so repeat calls to the same host reuse the
+        # TCP/TLS connection instead of handshaking on every request.
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=8, pool_maxsize=10)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         # If Birdeye has transport/server failures, skip it briefly and use DexScreener first.
         # Cooldown escalates with consecutive failures: 5m, 10m, 20m, ... up to 1h max.
         self._birdeye_disabled_until = 0.0
@@ -272,6 +328,10 @@ class MemecoinDataFetcher:
         self._birdeye_max_cooldown = 3600  # 1 hour max
         self._birdeye_consecutive_failures = 0
 
+    def close(self):
+        """Close pooled HTTP connections."""
+        self.session.close()
+
     def _make_request(self, url: str, source: str, headers: Optional[Dict] = None,
                       params: Optional[Dict] = None) -> requests.Response:
         """
@@ -281,7 +341,7 @@ class MemecoinDataFetcher:
         know exactly what went wrong and whether to retry.
         """
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=self.timeout)
+            response = self.session.get(url, headers=headers, params=params, timeout=self.timeout)
         except requests.exceptions.Timeout as e:
             raise TimeoutError(f"{source} request timed out", source, cause=e)
         except requests.exceptions.ConnectionError as e:
@@ -403,12 +463,7 @@ class MemecoinDataFetcher:
                         time.sleep(delay)
                         continue
                     # Try fallback after all retries exhausted — escalating cooldown
-                    self._birdeye_consecutive_failures += 1
-                    cooldown = min(
-                        self._birdeye_base_cooldown * (2 ** (self._birdeye_consecutive_failures - 1)),
-                        self._birdeye_max_cooldown
-                    )
-                    self._birdeye_disabled_until = time.time() + cooldown
+                    cooldown = self._trip_birdeye_breaker()
                     api_logger.warning("Birdeye failed, trying DexScreener fallback",
                         token=address[:8], error_type=type(e).__name__,
                         birdeye_disabled_seconds=cooldown,
@@ -429,6 +484,141 @@ class MemecoinDataFetcher:
 
         return None
 
+    def _trip_birdeye_breaker(self) -> float:
+        """Count a Birdeye failure and disable it for an escalating cooldown.
+
+        Returns:
+            Cooldown in seconds
+        """
+        self._birdeye_consecutive_failures += 1
+        cooldown = min(
+            self._birdeye_base_cooldown * (2 ** (self._birdeye_consecutive_failures - 1)),
+            self._birdeye_max_cooldown
+        )
+        self._birdeye_disabled_until = time.time() + cooldown
+        return cooldown
+
+    def fetch_birdeye_multi_price(self, addresses: List[str],
+                                  blockchain: str = 'solana',
+                                  rate_limiter: Optional[RateLimiter] = None) -> Dict[str, Dict[str, Any]]:
+        """Fetch price and liquidity for many tokens with Birdeye's multi_price.
+
+        Addresses are sorted and sent BIRDEYE_MULTI_PRICE_CHUNK at a time,
+        each chunk taking its own slot from rate_limiter when one is given.
+        Best effort: a chunk that fails is skipped and its addresses are
+        simply missing from the result, so callers fall back to
+        fetch_birdeye_data() for them. A transient failure trips the same
+        circuit breaker as fetch_birdeye_data() and skips the remaining
+        chunks.
+
+        Returns:
+            Dict mapping address to {'price_usd', 'liquidity_usd'}
+        """
+        if not addresses or not BIRDEYE_API_KEY or time.time() < self._birdeye_disabled_until:
+            return {}
+
+        chain_config = self.CHAIN_CONFIG.get(blockchain.lower(), self.CHAIN_CONFIG['solana'])
+        headers = {
+            "X-API-KEY": BIRDEYE_API_KEY,
+            "x-chain": chain_config['birdeye']
+        }
+        ordered = sorted(set(addresses))
+        prices: Dict[str, Dict[str, Any]] = {}
+
+        for start in range(0, len(ordered), self.BIRDEYE_MULTI_PRICE_CHUNK):
+            chunk = ordered[start:start + self.BIRDEYE_MULTI_PRICE_CHUNK]
+            params = {"list_address": ",".join(chunk), "include_liquidity": "true"}
+            if rate_limiter is not None:
+                rate_limiter.acquire()
+            with log_api_call(api_logger, self.BIRDEYE_MULTI_PRICE_API, 'GET',
+                              tokens=len(chunk)) as ctx:
+                try:
+                    response = self._make_request(
+                        self.BIRDEYE_MULTI_PRICE_API, 'Birdeye', headers=headers, params=params
+                    )
+                    ctx['status_code'] = response.status_code
+                    result = self._parse_json(response, 'Birdeye')
+                    ctx['success'] = True
+                    self._birdeye_consecutive_failures = 0
+                except (TimeoutError, NetworkError, ServerError) as e:
+                    cooldown = self._trip_birdeye_breaker()
+                    api_logger.warning("Birdeye multi_price failed, disabling Birdeye",
+                        tokens=len(ordered) - start, error_type=type(e).__name__, error=str(e),
+                        birdeye_disabled_seconds=cooldown,
+                        consecutive_failures=self._birdeye_consecutive_failures)
+                    break
+                except APIError as e:
+                    api_logger.warning("Birdeye multi_price failed, falling back to per-token lookups",
+                        tokens=len(chunk), error_type=type(e).__name__, error=str(e))
+                    continue
+
+            for address, data in (result.get('data') or {}).items():
+                if not data or data.get('value') is None:
+                    continue
+                try:
+                    prices[address] = {
+                        'price_usd': float(data['value']),
+                        'liquidity_usd': float(data['liquidity']) if data.get('liquidity') is not None else None,
+                    }
+                except (TypeError, ValueError):
+                    continue
+
+        return prices
+
+    def fetch_dexscreener_batch(self, addresses: List[str],
+                                blockchain: str = 'solana') -> Dict[str, Dict[str, Any]]:
+        """Fetch price, liquidity and market cap for many tokens from DexScreener.
+
+        Addresses are sorted and sent DEXSCREENER_BATCH_CHUNK at a time;
+        each token takes its highest-liquidity pair on the chain, as in
+        _fetch_dexscreener_fallback(). Best effort like
+        fetch_birdeye_multi_price(): failed chunks and tokens without pairs
+        are missing from the result.
+
+        Returns:
+            Dict mapping address to {'price_usd', 'liquidity_usd', 'market_cap'}
+        """
+        chain_config = self.CHAIN_CONFIG.get(blockchain.lower(), self.CHAIN_CONFIG['solana'])
+        ordered = sorted(set(addresses))
+        prices: Dict[str, Dict[str, Any]] = {}
+
+        for start in range(0, len(ordered), self.DEXSCREENER_BATCH_CHUNK):
+            chunk = ordered[start:start + self.DEXSCREENER_BATCH_CHUNK]
+            url = f"{self.DEXSCREENER_API}/{','.join(chunk)}"
+            with log_api_call(api_logger, self.DEXSCREENER_API, 'GET',
+                              tokens=len(chunk), source='DexScreener') as ctx:
+                try:
+                    response = self._make_request(url, 'DexScreener')
+                    ctx['status_code'] = response.status_code
+                    result = self._parse_json(response, 'DexScreener')
+                    ctx['success'] = True
+                except APIError as e:
+                    api_logger.warning("DexScreener batch failed, falling back to per-token lookups",
+                        tokens=len(chunk), error_type=type(e).__name__, error=str(e))
+                    continue
+
+            # EVM addresses may come back checksummed, so match case-insensitively
+            requested = {address.lower(): address for address in chunk}
+            best_liquidity: Dict[str, float] = {}
+            for pair in result.get('pairs') or []:
+                address = requested.get((pair.get('baseToken', {}).get('address') or '').lower())
+                if address is None or pair.get('chainId', chain_config['dexscreener']) != chain_config['dexscreener']:
+                    continue
+                try:
+                    liquidity = float(pair.get('liquidity', {}).get('usd', 0) or 0)
+                    if address in prices and liquidity <= best_liquidity[address]:
+                        continue
+                    prices[address] = {
+                        'price_usd': float(pair['priceUsd']),
+                        'liquidity_usd': liquidity,
+                        'market_cap': float(pair.get('fdv', 0) or 0),  # Fully diluted valuation
+                    }
+                    best_liquidity[address] = liquidity
+                except (KeyError, TypeError, ValueError):
+                    continue
+
+        return prices
+
     def fetch_security_data(self, address: str, blockchain: str = 'solana') -> Optional[Dict[str, Any]]:
         """Fetch token security data from GoPlus Security API (works on all chains)."""
         chain_config = self.CHAIN_CONFIG.get(blockchain.lower(), self.CHAIN_CONFIG['solana'])
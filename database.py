@@ -2,8 +2,19 @@ from __future__ import annotations
 
 import json
 import math
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List, TYPE_CHECKING
+from functools import lru_cache
+from statistics import fmean
+from typing import Optional, Dict, Any, Iterator, List, TYPE_CHECKING
+
+# orjson is optional; it encodes the nested raw_data API payloads several
+# times faster than the stdlib encoder
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 if TYPE_CHECKING:
     from psycopg2.extensions import connection as PgConnection, cursor as PgCursor
@@ -17,6 +28,321 @@ from config import DATABASE_URL, DEFAULT_DB_PATH, HIT_THRESHOLD
 
 # Connection pool for PostgreSQL (initialized lazily)
 _pg_connection_pool = None
+# Set once the PostgreSQL performance_tracking UPSERT target is verified
+_pg_upsert_index_checked = False
+
+# Bound once so insert paths skip the datetime.now attribute lookup. Timestamps
+# stay Python-generated local time rather than a SQLite column DEFAULT, which
+# would be UTC and would not reach the PostgreSQL schema or existing tables.
+_now = datetime.now
+
+
+def _dumps_raw_data(obj: Any) -> str:
+    """Serialize a snapshot's raw_data payload to a JSON string."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj).decode()
+        except TypeError:
+            pass  # e.g. non-str dict keys, which json.dumps coerces
+    # Same compact, unescaped-UTF-8 text orjson emits, so the stored format
+    # doesn't depend on whether it is installed
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False)
+
+
+# Joined per-call rows used to compute source_performance statistics
+_SOURCE_CALLS_SELECT = '''
+    SELECT
+        c.call_id,
+        c.source,
+        c.timestamp_received,
+        d.my_decision,
+        d.entry_price,
+        d.actual_exit_price,
+        p.max_gain_observed,
+        p.rug_pull_occurred,
+        p.time_to_max_gain_hours
+    FROM calls_received c
+    LEFT JOIN my_decisions d ON c.call_id = d.call_id
+    LEFT JOIN performance_tracking p ON c.call_id = p.call_id
+'''
+
+
+# source_performance columns returned by get_all_sources (source_id and
+# last_updated are never displayed)
+_SOURCE_STATS_COLUMNS = (
+    'source_name', 'total_calls', 'calls_traded', 'win_rate', 'avg_max_gain',
+    'rug_rate', 'hit_rate', 'tier', 'avg_time_to_max_gain_hours',
+    'median_max_gain', 'baseline_alpha', 'confidence_score',
+    'recent_hit_rate', 'sample_size',
+)
+
+# Hot-path write statements, built once at import. Keeping the exact same
+# string objects lets sqlite3's per-connection statement cache reuse the
+# prepared statement instead of re-parsing the SQL on every insert.
+_SQL_INSERT_CALL = '''
+    INSERT INTO calls_received
+    (timestamp_received, contract_address, token_symbol, token_name, source, blockchain)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+# A repeat contract_address returns the existing call_id from the same
+# statement; the no-op DO UPDATE (rather than DO NOTHING) is what makes
+# RETURNING yield the conflicting row.
+_SQL_UPSERT_CALL_RETURNING = _SQL_INSERT_CALL + '''
+    ON CONFLICT(contract_address) DO UPDATE SET contract_address = excluded.contract_address
+    RETURNING call_id
+'''
+
+_SQL_INSERT_SNAPSHOT = '''
+    INSERT INTO initial_snapshot (
+        call_id, snapshot_timestamp, liquidity_usd, holder_count,
+        top_holder_percent, top_10_holders_percent, token_age_hours,
+        market_cap, volume_24h, price_usd, mint_authority_revoked,
+        freeze_authority_revoked, rugcheck_score, safety_score, raw_data,
+        price_vs_atl_percent, buy_count_24h, sell_count_24h,
+        price_change_5m, price_change_1h, price_change_24h,
+        all_time_high, all_time_low, liquidity_locked_percent,
+        main_pool_liquidity, total_liquidity, main_pool_dex,
+        volume_liquidity_ratio, buy_sell_ratio, momentum_score, sol_price_usd
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+_SQL_INSERT_SNAPSHOT_RETURNING = _SQL_INSERT_SNAPSHOT + 'RETURNING snapshot_id'
+
+_SQL_INSERT_DECISION = '''
+    INSERT INTO my_decisions (
+        call_id, timestamp_decision, my_decision, trade_size_usd,
+        entry_price, entry_timestamp, reasoning_notes, emotional_state,
+        confidence_level, chart_assessment
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+_SQL_INSERT_DECISION_RETURNING = _SQL_INSERT_DECISION + 'RETURNING decision_id'
+
+# performance_tracking columns insert_or_update_performance may write, in
+# statement order. current_mcap/current_liquidity always take the latest
+# value; every other column keeps its stored value when the new one is NULL.
+_PERFORMANCE_COLUMNS = (
+    'price_1h_later', 'price_24h_later', 'price_7d_later', 'price_30d_later',
+    'current_mcap', 'current_liquidity', 'max_gain_observed', 'max_loss_observed',
+    'token_still_alive', 'rug_pull_occurred', 'checkpoint_type',
+    'max_price_since_entry', 'min_price_since_entry', 'price_15m_later',
+    'price_30m_later', 'time_to_max_gain_hours', 'time_to_rug_hours',
+    'max_gain_timestamp',
+)
+_PERFORMANCE_OVERWRITE = frozenset({'current_mcap', 'current_liquidity'})
+# Bound even when NULL: the overwrite columns, plus the booleans so a new row
+# stores "unknown" as NULL instead of the PostgreSQL column defaults
+_PERFORMANCE_ALWAYS_BOUND = _PERFORMANCE_OVERWRITE | {'token_still_alive', 'rug_pull_occurred'}
+
+
+@lru_cache(maxsize=128)
+def _performance_upsert_sql(columns: tuple[str, ...], returning: bool = True) -> str:
+    """Build the performance_tracking UPSERT for one set of bound columns.
+
+    Cached per column set so repeated shapes hand sqlite3 the same string
+    object and hit its prepared-statement cache. Pass returning=False for
+    executemany(), which can't return rows.
+    """
+    updates = ['last_updated = excluded.last_updated']
+    for col in columns:
+        if col in _PERFORMANCE_OVERWRITE:
+            updates.append(f'{col} = excluded.{col}')
+        else:
+            updates.append(f'{col} = COALESCE(excluded.{col}, performance_tracking.{col})')
+    set_clause = ',\n        '.join(updates)
+    return f'''
+    INSERT INTO performance_tracking (call_id, last_updated, {', '.join(columns)})
+    VALUES ({', '.join('?' * (len(columns) + 2))})
+    ON CONFLICT(call_id) DO UPDATE SET
+        {set_clause}
+{'    RETURNING tracking_id' if returning else ''}
+'''
+
+_SQL_INSERT_HISTORY = '''
+    INSERT INTO performance_history (
+        call_id, timestamp, decision_status, reference_price,
+        price_usd, liquidity_usd, total_liquidity, market_cap,
+        gain_loss_pct, price_change_pct, liquidity_change_pct, market_cap_change_pct,
+        token_still_alive, rug_pull_occurred
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+_SQL_INSERT_HISTORY_RETURNING = _SQL_INSERT_HISTORY + 'RETURNING history_id'
+
+# Bump when _SQLITE_SCHEMA changes; create_tables() skips the DDL when the
+# database's PRAGMA user_version is already at this version.
+SQLITE_SCHEMA_VERSION = 2
+
+_SQLITE_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS calls_received (
+    call_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp_received TEXT NOT NULL,
+    contract_address TEXT UNIQUE NOT NULL,
+    token_symbol TEXT,
+    token_name TEXT,
+    source TEXT,
+    blockchain TEXT DEFAULT 'Solana'
+);
+
+CREATE TABLE IF NOT EXISTS initial_snapshot (
+    snapshot_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    call_id INTEGER NOT NULL,
+    snapshot_timestamp TEXT NOT NULL,
+    liquidity_usd REAL,
+    holder_count INTEGER,
+    top_holder_percent REAL,
+    top_10_holders_percent REAL,
+    token_age_hours REAL,
+    market_cap REAL,
+    volume_24h REAL,
+    price_usd REAL,
+    mint_authority_revoked INTEGER,
+    freeze_authority_revoked INTEGER,
+    rugcheck_score REAL,
+    safety_score REAL,
+    raw_data TEXT,
+    price_vs_atl_percent REAL,
+    buy_count_24h INTEGER,
+    sell_count_24h INTEGER,
+    price_change_5m REAL,
+    price_change_1h REAL,
+    price_change_24h REAL,
+    all_time_high REAL,
+    all_time_low REAL,
+    liquidity_locked_percent REAL,
+    main_pool_liquidity REAL,
+    total_liquidity REAL,
+    main_pool_dex TEXT,
+    volume_liquidity_ratio REAL,
+    buy_sell_ratio REAL,
+    momentum_score REAL,
+    sol_price_usd REAL,
+    FOREIGN KEY (call_id) REFERENCES calls_received (call_id)
+);
+
+CREATE TABLE IF NOT EXISTS my_decisions (
+    decision_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    call_id INTEGER NOT NULL,
+    timestamp_decision TEXT NOT NULL,
+    my_decision TEXT NOT NULL,
+    trade_size_usd REAL,
+    entry_price REAL,
+    entry_timestamp TEXT,
+    reasoning_notes TEXT,
+    emotional_state TEXT,
+    confidence_level INTEGER,
+    chart_assessment TEXT,
+    actual_exit_price REAL,
+    hold_duration_hours REAL,
+    FOREIGN KEY (call_id) REFERENCES calls_received (call_id)
+);
+
+CREATE TABLE IF NOT EXISTS performance_tracking (
+    tracking_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    call_id INTEGER NOT NULL,
+    last_updated TEXT NOT NULL,
+    price_1h_later REAL,
+    price_24h_later REAL,
+    price_7d_later REAL,
+    price_30d_later REAL,
+    current_mcap REAL,
+    current_liquidity REAL,
+    max_gain_observed REAL,
+    max_loss_observed REAL,
+    token_still_alive TEXT,
+    rug_pull_occurred TEXT,
+    checkpoint_type TEXT,
+    max_price_since_entry REAL,
+    min_price_since_entry REAL,
+    price_15m_later REAL,
+    price_30m_later REAL,
+    time_to_max_gain_hours REAL,
+    time_to_rug_hours REAL,
+    max_gain_timestamp TEXT,
+    FOREIGN KEY (call_id) REFERENCES calls_received (call_id)
+);
+
+CREATE TABLE IF NOT EXISTS performance_history (
+    history_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    call_id INTEGER NOT NULL,
+    timestamp TEXT NOT NULL,
+    decision_status TEXT NOT NULL,
+    reference_price REAL,
+    price_usd REAL,
+    liquidity_usd REAL,
+    total_liquidity REAL,
+    market_cap REAL,
+    gain_loss_pct REAL,
+    price_change_pct REAL,
+    liquidity_change_pct REAL,
+    market_cap_change_pct REAL,
+    token_still_alive TEXT,
+    rug_pull_occurred TEXT,
+    FOREIGN KEY (call_id) REFERENCES calls_received (call_id)
+);
+
+CREATE TABLE IF NOT EXISTS source_performance (
+    source_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source_name TEXT UNIQUE NOT NULL,
+    total_calls INTEGER DEFAULT 0,
+    calls_traded INTEGER DEFAULT 0,
+    win_rate REAL DEFAULT 0.0,
+    avg_max_gain REAL DEFAULT 0.0,
+    rug_rate REAL DEFAULT 0.0,
+    hit_rate REAL DEFAULT 0.0,
+    tier TEXT DEFAULT 'C',
+    last_updated TEXT NOT NULL,
+    avg_time_to_max_gain_hours REAL,
+    median_max_gain REAL,
+    baseline_alpha REAL,
+    confidence_score REAL,
+    recent_hit_rate REAL,
+    sample_size INTEGER DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS tracked_wallets (
+    wallet_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    wallet_address TEXT UNIQUE NOT NULL,
+    wallet_name TEXT NOT NULL,
+    total_tracked_buys INTEGER DEFAULT 0,
+    win_rate REAL DEFAULT 0.0,
+    avg_gain REAL DEFAULT 0.0,
+    tier TEXT DEFAULT 'C',
+    notes TEXT,
+    date_added TEXT NOT NULL
+);
+
+-- Indexes for foreign keys and frequently queried columns
+CREATE INDEX IF NOT EXISTS idx_initial_snapshot_call_id ON initial_snapshot(call_id);
+CREATE INDEX IF NOT EXISTS idx_my_decisions_call_id ON my_decisions(call_id);
+CREATE INDEX IF NOT EXISTS idx_calls_received_source ON calls_received(source);
+CREATE INDEX IF NOT EXISTS idx_calls_received_contract ON calls_received(contract_address);
+CREATE INDEX IF NOT EXISTS idx_tracked_wallets_address ON tracked_wallets(wallet_address);
+CREATE INDEX IF NOT EXISTS idx_performance_history_call_id ON performance_history(call_id);
+CREATE INDEX IF NOT EXISTS idx_performance_history_timestamp ON performance_history(timestamp);
+-- Latest-snapshot lookup per call (WHERE call_id = ? ORDER BY timestamp DESC LIMIT 1)
+CREATE INDEX IF NOT EXISTS idx_performance_history_call_timestamp ON performance_history(call_id, timestamp);
+-- Global gain stats range-scan this column instead of the whole table
+CREATE INDEX IF NOT EXISTS idx_performance_tracking_max_gain ON performance_tracking(max_gain_observed);
+-- Decisions the performance tracker still follows (its WHERE clause verbatim,
+-- so the planner can use this partial index instead of scanning my_decisions)
+CREATE INDEX IF NOT EXISTS idx_decisions_active ON my_decisions(call_id)
+    WHERE my_decision = 'WATCH'
+       OR (my_decision = 'TRADE' AND (actual_exit_price IS NULL OR actual_exit_price = 0));
+'''
+
+# sqlite3 caches 128 statements per connection by default; leave headroom for
+# the ad-hoc queries issued by analyzer/scripts on the same connection.
+SQLITE_CACHED_STATEMENTS = 256
+
+# Idle read-only connections kept per MemecoinDatabase. WAL lets these read
+# committed data while the single write connection holds its lock.
+SQLITE_READ_POOL_SIZE = 4
+
+# call_ids per IN (...) list in the bulk getters, well under SQLite's
+# bound-parameter limit
+_BULK_READ_CHUNK = 500
+# Sources matched per query in _fetch_calls_for_sources (four parameters each)
+_SOURCE_MATCH_CHUNK = 100
+# Statements joined per round-trip by _executemany on PostgreSQL
+_PG_BATCH_PAGE_SIZE = 500
 
 
 def get_pg_pool():
@@ -33,6 +359,20 @@ def get_pg_pool():
     return _pg_connection_pool
 
 
+def configure_sqlite_connection(conn: SqliteConnection) -> None:
+    """Apply connection-level PRAGMAs for the local SQLite database.
+
+    WAL lets readers run while a writer commits, and synchronous=NORMAL
+    drops the per-commit fsync (WAL is still synced at checkpoints).
+    """
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA busy_timeout=5000')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA cache_size=-20000')  # ~20 MB page cache
+    conn.execute('PRAGMA mmap_size=268435456')  # read pages via a 256 MB memory map
+
+
 def get_db_connection():
     """Get database connection based on environment."""
     if DATABASE_URL:
@@ -42,7 +382,8 @@ def get_db_connection():
         return conn, 'postgres'
     else:
         import sqlite3
-        conn = sqlite3.connect(DEFAULT_DB_PATH)
+        conn = sqlite3.connect(DEFAULT_DB_PATH, cached_statements=SQLITE_CACHED_STATEMENTS)
+        configure_sqlite_connection(conn)
         conn.row_factory = sqlite3.Row
         return conn, 'sqlite'
 
@@ -56,6 +397,9 @@ class MemecoinDatabase:
     conn: PgConnection | SqliteConnection
     cursor: PgCursor | SqliteCursor
     _using_pool: bool
+    _in_txn: bool
+    _write_lock: threading.RLock
+    _read_pool: List[SqliteConnection] | None
 
     def __init__(self, db_path: str | None = None, use_pool: bool = True):
         """Initialize database connection.
@@ -65,6 +409,13 @@ class MemecoinDatabase:
             use_pool: Whether to use connection pooling for PostgreSQL
         """
         self._using_pool = False
+        self._in_txn = False
+        # Serializes writes (and reads that must see uncommitted writes) on
+        # self.conn so one instance can be shared between threads
+        self._write_lock = threading.RLock()
+        self._read_pool = None
+        # INSERT ... RETURNING needs SQLite 3.35+; PostgreSQL always has it
+        self._has_returning = True
 
         if DATABASE_URL:
             # Use PostgreSQL (Supabase)
@@ -86,14 +437,23 @@ class MemecoinDatabase:
             self.cursor = self.conn.cursor(cursor_factory=RealDictCursor)
             self.db_type = 'postgres'
             self.db_path = DATABASE_URL[:50] + '...'  # Truncate for display
+            self._ensure_pg_unique_performance_call_id()
         else:
             # Use SQLite
             import sqlite3
             self.db_path = db_path or DEFAULT_DB_PATH
-            self.conn = sqlite3.connect(self.db_path)
+            self.conn = sqlite3.connect(
+                self.db_path,
+                cached_statements=SQLITE_CACHED_STATEMENTS,
+                check_same_thread=False,  # guarded by _write_lock
+            )
+            configure_sqlite_connection(self.conn)
             self.conn.row_factory = sqlite3.Row
             self.cursor = self.conn.cursor()
             self.db_type = 'sqlite'
+            self._has_returning = sqlite3.sqlite_version_info >= (3, 35)
+            if self.db_path != ':memory:':
+                self._read_pool = []
             self.create_tables()
 
     @staticmethod
@@ -154,176 +514,119 @@ class MemecoinDatabase:
         return value == 'yes'
 
     def create_tables(self) -> None:
-        """Create all database tables if they don't exist (SQLite only - PostgreSQL uses migration)."""
+        """Create all database tables if they don't exist (SQLite only - PostgreSQL uses migration).
+
+        The whole schema runs as one executescript() in a single transaction,
+        and is skipped entirely once PRAGMA user_version records it.
+        """
         if self.db_type == 'postgres':
             return  # Tables created via SQL migration in Supabase
 
-        # SQLite table creation (same as before)
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS calls_received (
-                call_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp_received TEXT NOT NULL,
-                contract_address TEXT UNIQUE NOT NULL,
-                token_symbol TEXT,
-                token_name TEXT,
-                source TEXT,
-                blockchain TEXT DEFAULT 'Solana'
-            )
-        ''')
+        self.cursor.execute('PRAGMA user_version')
+        if self.cursor.fetchone()[0] >= SQLITE_SCHEMA_VERSION:
+            return
 
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS initial_snapshot (
-                snapshot_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                call_id INTEGER NOT NULL,
-                snapshot_timestamp TEXT NOT NULL,
-                liquidity_usd REAL,
-                holder_count INTEGER,
-                top_holder_percent REAL,
-                top_10_holders_percent REAL,
-                token_age_hours REAL,
-                market_cap REAL,
-                volume_24h REAL,
-                price_usd REAL,
-                mint_authority_revoked INTEGER,
-                freeze_authority_revoked INTEGER,
-                rugcheck_score REAL,
-                safety_score REAL,
-                raw_data TEXT,
-                price_vs_atl_percent REAL,
-                buy_count_24h INTEGER,
-                sell_count_24h INTEGER,
-                price_change_5m REAL,
-                price_change_1h REAL,
-                price_change_24h REAL,
-                all_time_high REAL,
-                all_time_low REAL,
-                liquidity_locked_percent REAL,
-                main_pool_liquidity REAL,
-                total_liquidity REAL,
-                main_pool_dex TEXT,
-                volume_liquidity_ratio REAL,
-                buy_sell_ratio REAL,
-                momentum_score REAL,
-                sol_price_usd REAL,
-                FOREIGN KEY (call_id) REFERENCES calls_received (call_id)
-            )
-        ''')
+        try:
+            # executescript() runs outside sqlite3's implicit transactions,
+            # so open one explicitly to pay for a single commit
+            self.conn.executescript('BEGIN;\n' + _SQLITE_SCHEMA)
+            self._ensure_unique_performance_call_id()
+            self.cursor.execute(f'PRAGMA user_version = {SQLITE_SCHEMA_VERSION}')
+            self.conn.commit()
+        except BaseException:
+            self.conn.rollback()
+            raise
 
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS my_decisions (
-                decision_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                call_id INTEGER NOT NULL,
-                timestamp_decision TEXT NOT NULL,
-                my_decision TEXT NOT NULL,
-                trade_size_usd REAL,
-                entry_price REAL,
-                entry_timestamp TEXT,
-                reasoning_notes TEXT,
-                emotional_state TEXT,
-                confidence_level INTEGER,
-                chart_assessment TEXT,
-                actual_exit_price REAL,
-                hold_duration_hours REAL,
-                FOREIGN KEY (call_id) REFERENCES calls_received (call_id)
-            )
-        ''')
+        db_logger.info("SQLite tables and indexes created/verified")
 
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS performance_tracking (
-                tracking_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                call_id INTEGER NOT NULL,
-                last_updated TEXT NOT NULL,
-                price_1h_later REAL,
-                price_24h_later REAL,
-                price_7d_later REAL,
-                price_30d_later REAL,
-                current_mcap REAL,
-                current_liquidity REAL,
-                max_gain_observed REAL,
-                max_loss_observed REAL,
-                token_still_alive TEXT,
-                rug_pull_occurred TEXT,
-                checkpoint_type TEXT,
-                max_price_since_entry REAL,
-                min_price_since_entry REAL,
-                price_15m_later REAL,
-                price_30m_later REAL,
-                time_to_max_gain_hours REAL,
-                time_to_rug_hours REAL,
-                max_gain_timestamp TEXT,
-                FOREIGN KEY (call_id) REFERENCES calls_received (call_id)
-            )
-        ''')
+    def _ensure_unique_performance_call_id(self) -> None:
+        """Make performance_tracking.call_id unique (target of the UPSERT).
 
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS performance_history (
-                history_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                call_id INTEGER NOT NULL,
-                timestamp TEXT NOT NULL,
-                decision_status TEXT NOT NULL,
-                reference_price REAL,
-                price_usd REAL,
-                liquidity_usd REAL,
-                total_liquidity REAL,
-                market_cap REAL,
-                gain_loss_pct REAL,
-                price_change_pct REAL,
-                liquidity_change_pct REAL,
-                market_cap_change_pct REAL,
-                token_still_alive TEXT,
-                rug_pull_occurred TEXT,
-                FOREIGN KEY (call_id) REFERENCES calls_received (call_id)
-            )
-        ''')
+        Older databases used a plain index and could hold duplicate rows
+        per call_id. Runs inside create_tables' transaction.
+        """
+        self.cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_performance_tracking_call_id_unique'"
+        )
+        if self.cursor.fetchone():
+            return
+        self._make_performance_call_id_unique()
 
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS source_performance (
-                source_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                source_name TEXT UNIQUE NOT NULL,
-                total_calls INTEGER DEFAULT 0,
-                calls_traded INTEGER DEFAULT 0,
-                win_rate REAL DEFAULT 0.0,
-                avg_max_gain REAL DEFAULT 0.0,
-                rug_rate REAL DEFAULT 0.0,
-                hit_rate REAL DEFAULT 0.0,
-                tier TEXT DEFAULT 'C',
-                last_updated TEXT NOT NULL,
-                avg_time_to_max_gain_hours REAL,
-                median_max_gain REAL,
-                baseline_alpha REAL,
-                confidence_score REAL,
-                recent_hit_rate REAL,
-                sample_size INTEGER DEFAULT 0
-            )
-        ''')
+    def _ensure_pg_unique_performance_call_id(self) -> None:
+        """PostgreSQL counterpart of _ensure_unique_performance_call_id().
 
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS tracked_wallets (
-                wallet_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                wallet_address TEXT UNIQUE NOT NULL,
-                wallet_name TEXT NOT NULL,
-                total_tracked_buys INTEGER DEFAULT 0,
-                win_rate REAL DEFAULT 0.0,
-                avg_gain REAL DEFAULT 0.0,
-                tier TEXT DEFAULT 'C',
-                notes TEXT,
-                date_added TEXT NOT NULL
+        Supabase databases set up before the UPSERT (without STEP 4b of
+        supabase_migration_v2.sql) only have a plain index on call_id, and
+        every ON CONFLICT(call_id) write would fail. Checked once per process;
+        raises RuntimeError if the index can't be created.
+        """
+        global _pg_upsert_index_checked
+        if _pg_upsert_index_checked:
+            return
+        import psycopg2
+        try:
+            with self.transaction():
+                # Any unique, non-partial index on call_id alone will do, e.g.
+                # the one behind supabase_setup.sql's UNIQUE constraint
+                self._execute('''
+                    SELECT 1 FROM pg_index i
+                    JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = i.indkey[0]
+                    WHERE i.indrelid = 'performance_tracking'::regclass
+                      AND i.indisunique AND i.indnatts = 1 AND i.indpred IS NULL
+                      AND a.attname = 'call_id'
+                ''')
+                if self._fetchone() is None:
+                    self._make_performance_call_id_unique()
+        except psycopg2.Error as e:
+            raise RuntimeError(
+                "performance_tracking.call_id needs a unique index for the tracker's UPSERT; "
+                f"run STEP 4b of supabase_migration_v2.sql ({e})"
+            ) from e
+        _pg_upsert_index_checked = True
+
+    def _make_performance_call_id_unique(self) -> None:
+        """Keep the oldest performance_tracking row per call_id and index call_id uniquely."""
+        self._execute('''
+            DELETE FROM performance_tracking
+            WHERE tracking_id NOT IN (
+                SELECT MIN(tracking_id) FROM performance_tracking GROUP BY call_id
             )
         ''')
+        if self.cursor.rowcount > 0:
+            db_logger.warning(f"Removed {self.cursor.rowcount} duplicate performance_tracking rows")
+        self._execute('DROP INDEX IF EXISTS idx_performance_tracking_call_id')
+        self._execute(
+            'CREATE UNIQUE INDEX IF NOT EXISTS idx_performance_tracking_call_id_unique '
+            'ON performance_tracking(call_id)'
+        )
 
-        # Create indexes for foreign keys and frequently queried columns
-        # This dramatically improves JOIN and lookup performance
-        self.cursor.execute('CREATE INDEX IF NOT EXISTS idx_initial_snapshot_call_id ON initial_snapshot(call_id)')
-        self.cursor.execute('CREATE INDEX IF NOT EXISTS idx_my_decisions_call_id ON my_decisions(call_id)')
-        self.cursor.execute('CREATE INDEX IF NOT EXISTS idx_performance_tracking_call_id ON performance_tracking(call_id)')
-        self.cursor.execute('CREATE INDEX IF NOT EXISTS idx_calls_received_source ON calls_received(source)')
-        self.cursor.execute('CREATE INDEX IF NOT EXISTS idx_calls_received_contract ON calls_received(contract_address)')
-        self.cursor.execute('CREATE INDEX IF NOT EXISTS idx_tracked_wallets_address ON tracked_wallets(wallet_address)')
-        self.cursor.execute('CREATE INDEX IF NOT EXISTS idx_performance_history_call_id ON performance_history(call_id)')
-        self.cursor.execute('CREATE INDEX IF NOT EXISTS idx_performance_history_timestamp ON performance_history(timestamp)')
-
-        self.conn.commit()
-        db_logger.info("SQLite tables and indexes created/verified")
+    @contextmanager
+    def transaction(self) -> Iterator[MemecoinDatabase]:
+        """Group several writes into a single commit.
+
+        Every write method runs inside one of these blocks; the whole block
+        is committed on exit or rolled back on error. Nested calls join the
+        outer transaction. The block holds the instance's write lock, so
+        other threads sharing this object wait until it commits.
+        """
+        with self._write_lock:
+            if self._in_txn:
+                yield self
+                return
+
+            if self.db_type == 'sqlite' and not self.conn.in_transaction:
+                # Take the write lock up front so the block can't deadlock
+                # upgrading from a read lock halfway through.
+                self.cursor.execute('BEGIN IMMEDIATE')
+            self._in_txn = True
+            try:
+                yield self
+                self.conn.commit()
+            except BaseException:
+                self.conn.rollback()
+                raise
+            finally:
+                self._in_txn = False
 
     def _execute(self, query: str, params: tuple | None = None) -> None:
         """Execute a query with proper placeholder substitution."""
@@ -332,6 +635,92 @@ class MemecoinDatabase:
             query = query.replace('?', '%s')
         self.cursor.execute(query, params or ())
 
+    def _executemany(self, query: str, params_seq: List[tuple]) -> None:
+        """executemany() with the same placeholder substitution as _execute().
+
+        psycopg2's executemany() is one round-trip per row, so PostgreSQL
+        goes through execute_batch(), which sends _PG_BATCH_PAGE_SIZE
+        statements per round-trip.
+        """
+        if self.db_type == 'postgres':
+            from psycopg2.extras import execute_batch
+            execute_batch(self.cursor, query.replace('?', '%s'), params_seq,
+                          page_size=_PG_BATCH_PAGE_SIZE)
+        else:
+            self.cursor.executemany(query, params_seq)
+
+    @contextmanager
+    def _read_cursor(self) -> Iterator[PgCursor | SqliteCursor]:
+        """Yield a short-lived cursor for a read-only query.
+
+        On SQLite the cursor comes from a pooled read-only connection, so
+        reads don't wait for the write lock. While self.conn has uncommitted
+        writes the read goes through self.conn instead, so callers still see
+        their own writes.
+        """
+        if self._read_pool is not None and not self.conn.in_transaction:
+            conn = self._acquire_reader()
+            cur = conn.cursor()
+            try:
+                yield cur
+            finally:
+                cur.close()
+                self._release_reader(conn)
+            return
+
+        with self._write_lock:
+            if self.db_type == 'postgres':
+                from psycopg2.extras import RealDictCursor
+                cur = self.conn.cursor(cursor_factory=RealDictCursor)
+            else:
+                cur = self.conn.cursor()
+            try:
+                yield cur
+            finally:
+                cur.close()
+
+    def _acquire_reader(self) -> SqliteConnection:
+        """Take an idle read-only connection from the pool, or open one."""
+        with self._write_lock:
+            if self._read_pool:
+                return self._read_pool.pop()
+        import sqlite3
+        from pathlib import Path
+        conn = sqlite3.connect(
+            Path(self.db_path).absolute().as_uri() + '?mode=ro',
+            uri=True,
+            cached_statements=SQLITE_CACHED_STATEMENTS,
+            check_same_thread=False,
+        )
+        conn.execute('PRAGMA busy_timeout=5000')
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _release_reader(self, conn: SqliteConnection) -> None:
+        """Return a read-only connection to the pool, closing any surplus."""
+        with self._write_lock:
+            if self._read_pool is not None and len(self._read_pool) < SQLITE_READ_POOL_SIZE:
+                self._read_pool.append(conn)
+                return
+        conn.close()
+
+    def _query(self, query: str, params: tuple | None = None) -> List[Dict[str, Any]]:
+        """Run a read-only query on its own cursor and return all rows as dicts."""
+        if self.db_type == 'postgres':
+            query = query.replace('?', '%s')
+        with self._read_cursor() as cur:
+            cur.execute(query, params or ())
+            return [dict(row) for row in cur.fetchall()]
+
+    def _query_one(self, query: str, params: tuple | None = None) -> Dict[str, Any] | None:
+        """Like _query() but return only the first row, or None."""
+        if self.db_type == 'postgres':
+            query = query.replace('?', '%s')
+        with self._read_cursor() as cur:
+            cur.execute(query, params or ())
+            row = cur.fetchone()
+            return dict(row) if row is not None else None
+
     def _fetchone(self) -> Dict[str, Any] | None:
         """Fetch one result as dict."""
         row = self.cursor.fetchone()
@@ -347,49 +736,44 @@ class MemecoinDatabase:
     def insert_call(self, contract_address: str, token_symbol: str, token_name: str,
                     source: str, blockchain: str = "Solana") -> int:
         """Insert a new call received record."""
-        timestamp = datetime.now().isoformat()
+        timestamp = _now().isoformat()
         source = self.normalize_sources(source) if source else source
         blockchain = self.normalize_blockchain(blockchain)
 
+        params = (timestamp, contract_address, token_symbol, token_name, source, blockchain)
+        with self.transaction():
+            # A failed INSERT must not discard a caller's earlier writes
+            self._execute('SAVEPOINT insert_call')
+            try:
+                if self._has_returning:
+                    self._execute(_SQL_UPSERT_CALL_RETURNING, params)
+                    return self._fetchone()['call_id']
+                return self._insert_call_legacy(params)
+            except Exception as e:
+                self._execute('ROLLBACK TO SAVEPOINT insert_call')
+                db_logger.error(f"Failed to insert call for {contract_address}: {e}")
+                return -1
+
+    def _insert_call_legacy(self, params: tuple) -> int:
+        """Plain INSERT with a lookup on duplicate, for SQLite without RETURNING."""
+        import sqlite3
         try:
-            if self.db_type == 'postgres':
-                self._execute('''
-                    INSERT INTO calls_received
-                    (timestamp_received, contract_address, token_symbol, token_name, source, blockchain)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                    RETURNING call_id
-                ''', (timestamp, contract_address, token_symbol, token_name, source, blockchain))
-                result = self._fetchone()
-                self.conn.commit()
-                return result['call_id']
-            else:
-                self._execute('''
-                    INSERT INTO calls_received
-                    (timestamp_received, contract_address, token_symbol, token_name, source, blockchain)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (timestamp, contract_address, token_symbol, token_name, source, blockchain))
-                self.conn.commit()
-                return self.cursor.lastrowid
-        except Exception as e:
-            self.conn.rollback()
-            # Check if this is a unique constraint violation (contract already exists)
-            error_str = str(e).lower()
-            if 'unique' in error_str or 'duplicate' in error_str:
-                # Contract address already exists, return existing call_id
-                self._execute(
-                    'SELECT call_id FROM calls_received WHERE contract_address = ?',
-                    (contract_address,)
-                )
-                result = self._fetchone()
-                if result:
-                    return result['call_id']
-            # Log unexpected errors
-            db_logger.error(f"Failed to insert call for {contract_address}: {e}")
-            return -1
+            self._execute(_SQL_INSERT_CALL, params)
+            return self.cursor.lastrowid
+        except sqlite3.IntegrityError:
+            # Contract address already exists, return existing call_id
+            self._execute(
+                'SELECT call_id FROM calls_received WHERE contract_address = ?',
+                (params[1],)
+            )
+            result = self._fetchone()
+            if result is None:
+                raise
+            return result['call_id']
 
     def insert_snapshot(self, call_id: int, data: Dict[str, Any]) -> int:
         """Insert initial snapshot data."""
-        timestamp = datetime.now().isoformat()
+        timestamp = _now().isoformat()
 
         # Calculate volume/liquidity ratio
         volume = data.get('volume_24h') or 0
@@ -419,7 +803,7 @@ class MemecoinDatabase:
             data.get('freeze_authority_revoked'),
             data.get('rugcheck_score'),
             data.get('safety_score'),
-            json.dumps(data.get('raw_data', {})),
+            _dumps_raw_data(data.get('raw_data', {})),
             data.get('price_vs_atl_percent'),
             data.get('buy_count_24h'),
             data.get('sell_count_24h'),
@@ -438,40 +822,13 @@ class MemecoinDatabase:
             data.get('sol_price_usd'),
         )
 
-        if self.db_type == 'postgres':
-            self._execute('''
-                INSERT INTO initial_snapshot (
-                    call_id, snapshot_timestamp, liquidity_usd, holder_count,
-                    top_holder_percent, top_10_holders_percent, token_age_hours,
-                    market_cap, volume_24h, price_usd, mint_authority_revoked,
-                    freeze_authority_revoked, rugcheck_score, safety_score, raw_data,
-                    price_vs_atl_percent, buy_count_24h, sell_count_24h,
-                    price_change_5m, price_change_1h, price_change_24h,
-                    all_time_high, all_time_low, liquidity_locked_percent,
-                    main_pool_liquidity, total_liquidity, main_pool_dex,
-                    volume_liquidity_ratio, buy_sell_ratio, momentum_score, sol_price_usd
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                RETURNING snapshot_id
-            ''', params)
-            result = self._fetchone()
-            self.conn.commit()
-            return result['snapshot_id']
-        else:
-            self._execute('''
-                INSERT INTO initial_snapshot (
-                    call_id, snapshot_timestamp, liquidity_usd, holder_count,
-                    top_holder_percent, top_10_holders_percent, token_age_hours,
-                    market_cap, volume_24h, price_usd, mint_authority_revoked,
-                    freeze_authority_revoked, rugcheck_score, safety_score, raw_data,
-                    price_vs_atl_percent, buy_count_24h, sell_count_24h,
-                    price_change_5m, price_change_1h, price_change_24h,
-                    all_time_high, all_time_low, liquidity_locked_percent,
-                    main_pool_liquidity, total_liquidity, main_pool_dex,
-                    volume_liquidity_ratio, buy_sell_ratio, momentum_score, sol_price_usd
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', params)
-            self.conn.commit()
-            return self.cursor.lastrowid
+        with self.transaction():
+            if self.db_type == 'postgres':
+                self._execute(_SQL_INSERT_SNAPSHOT_RETURNING, params)
+                return self._fetchone()['snapshot_id']
+            else:
+                self._execute(_SQL_INSERT_SNAPSHOT, params)
+                return self.cursor.lastrowid
 
     def insert_decision(self, call_id: int, decision: str, trade_size_usd: Optional[float],
                        entry_price: Optional[float], reasoning_notes: str,
@@ -479,7 +836,7 @@ class MemecoinDatabase:
                        chart_assessment: Optional[str] = None,
                        entry_timestamp: Optional[str] = None) -> int:
         """Insert user's trading decision."""
-        timestamp = datetime.now().isoformat()
+        timestamp = _now().isoformat()
 
         if decision == 'TRADE' and not entry_timestamp:
             entry_timestamp = timestamp
@@ -487,58 +844,43 @@ class MemecoinDatabase:
         params = (call_id, timestamp, decision, trade_size_usd, entry_price, entry_timestamp,
                   reasoning_notes, emotional_state, confidence_level, chart_assessment)
 
-        if self.db_type == 'postgres':
-            self._execute('''
-                INSERT INTO my_decisions (
-                    call_id, timestamp_decision, my_decision, trade_size_usd,
-                    entry_price, entry_timestamp, reasoning_notes, emotional_state,
-                    confidence_level, chart_assessment
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                RETURNING decision_id
-            ''', params)
-            result = self._fetchone()
-            self.conn.commit()
-            return result['decision_id']
-        else:
-            self._execute('''
-                INSERT INTO my_decisions (
-                    call_id, timestamp_decision, my_decision, trade_size_usd,
-                    entry_price, entry_timestamp, reasoning_notes, emotional_state,
-                    confidence_level, chart_assessment
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', params)
-            self.conn.commit()
-            return self.cursor.lastrowid
+        with self.transaction():
+            if self.db_type == 'postgres':
+                self._execute(_SQL_INSERT_DECISION_RETURNING, params)
+                return self._fetchone()['decision_id']
+            else:
+                self._execute(_SQL_INSERT_DECISION, params)
+                return self.cursor.lastrowid
 
     def record_exit(self, call_id: int, exit_price: float) -> bool:
         """Record exit from a trade and calculate hold duration."""
-        self._execute('''
-            SELECT timestamp_decision, entry_timestamp FROM my_decisions
-            WHERE call_id = ? AND my_decision = 'TRADE'
-        ''', (call_id,))
+        with self.transaction():
+            self._execute('''
+                SELECT timestamp_decision, entry_timestamp FROM my_decisions
+                WHERE call_id = ? AND my_decision = 'TRADE'
+            ''', (call_id,))
 
-        result = self._fetchone()
-        if not result:
-            return False
+            result = self._fetchone()
+            if not result:
+                return False
 
-        entry_time_raw = result.get('entry_timestamp') or result.get('timestamp_decision')
-        entry_time = datetime.fromisoformat(entry_time_raw)
-        exit_time = datetime.now()
-        hold_duration = (exit_time - entry_time).total_seconds() / 3600
+            entry_time_raw = result.get('entry_timestamp') or result.get('timestamp_decision')
+            entry_time = datetime.fromisoformat(entry_time_raw)
+            exit_time = _now()
+            hold_duration = (exit_time - entry_time).total_seconds() / 3600
 
-        self._execute('''
-            UPDATE my_decisions SET
-                actual_exit_price = ?,
-                hold_duration_hours = ?
-            WHERE call_id = ? AND my_decision = 'TRADE'
-        ''', (exit_price, hold_duration, call_id))
+            self._execute('''
+                UPDATE my_decisions SET
+                    actual_exit_price = ?,
+                    hold_duration_hours = ?
+                WHERE call_id = ? AND my_decision = 'TRADE'
+            ''', (exit_price, hold_duration, call_id))
 
-        self.conn.commit()
         return True
 
     def get_open_trades(self) -> List[Dict[str, Any]]:
         """Get all open trades (TRADE decisions without exit recorded)."""
-        self._execute('''
+        return self._query('''
             SELECT
                 c.call_id,
                 c.token_symbol,
@@ -554,129 +896,23 @@ class MemecoinDatabase:
             WHERE d.my_decision = 'TRADE' AND d.actual_exit_price IS NULL
             ORDER BY d.timestamp_decision DESC
         ''')
-        return self._fetchall()
-
-    def insert_or_update_performance(self, call_id: int, data: Dict[str, Any]) -> int:
-        """Insert or update performance tracking data."""
-        timestamp = datetime.now().isoformat()
 
+    def _performance_params(self, call_id: int, data: Dict[str, Any],
+                            timestamp: str) -> tuple[tuple[str, ...], tuple]:
+        """Return the bound columns and parameters of one performance UPSERT."""
         # Convert boolean fields to appropriate type for database
-        token_alive = self._to_bool(data.get('token_still_alive'))
-        rug_occurred = self._to_bool(data.get('rug_pull_occurred'))
-
-        self._execute(
-            'SELECT tracking_id FROM performance_tracking WHERE call_id = ?',
-            (call_id,)
-        )
-        existing = self._fetchone()
-
-        if existing:
-            self._execute('''
-                UPDATE performance_tracking SET
-                    last_updated = ?,
-                    price_1h_later = COALESCE(?, price_1h_later),
-                    price_24h_later = COALESCE(?, price_24h_later),
-                    price_7d_later = COALESCE(?, price_7d_later),
-                    price_30d_later = COALESCE(?, price_30d_later),
-                    current_mcap = ?,
-                    current_liquidity = ?,
-                    max_gain_observed = COALESCE(?, max_gain_observed),
-                    max_loss_observed = COALESCE(?, max_loss_observed),
-                    token_still_alive = COALESCE(?, token_still_alive),
-                    rug_pull_occurred = COALESCE(?, rug_pull_occurred),
-                    checkpoint_type = COALESCE(?, checkpoint_type),
-                    max_price_since_entry = COALESCE(?, max_price_since_entry),
-                    min_price_since_entry = COALESCE(?, min_price_since_entry),
-                    price_15m_later = COALESCE(?, price_15m_later),
-                    price_30m_later = COALESCE(?, price_30m_later),
-                    time_to_max_gain_hours = COALESCE(?, time_to_max_gain_hours),
-                    time_to_rug_hours = COALESCE(?, time_to_rug_hours),
-                    max_gain_timestamp = COALESCE(?, max_gain_timestamp)
-                WHERE call_id = ?
-            ''', (
-                timestamp,
-                data.get('price_1h_later'),
-                data.get('price_24h_later'),
-                data.get('price_7d_later'),
-                data.get('price_30d_later'),
-                data.get('current_mcap'),
-                data.get('current_liquidity'),
-                data.get('max_gain_observed'),
-                data.get('max_loss_observed'),
-                token_alive,
-                rug_occurred,
-                data.get('checkpoint_type'),
-                data.get('max_price_since_entry'),
-                data.get('min_price_since_entry'),
-                data.get('price_15m_later'),
-                data.get('price_30m_later'),
-                data.get('time_to_max_gain_hours'),
-                data.get('time_to_rug_hours'),
-                data.get('max_gain_timestamp'),
-                call_id
-            ))
-            tracking_id = existing['tracking_id']
-        else:
-            params = (
-                call_id, timestamp,
-                data.get('price_1h_later'),
-                data.get('price_24h_later'),
-                data.get('price_7d_later'),
-                data.get('price_30d_later'),
-                data.get('current_mcap'),
-                data.get('current_liquidity'),
-                data.get('max_gain_observed'),
-                data.get('max_loss_observed'),
-                token_alive,
-                rug_occurred,
-                data.get('checkpoint_type'),
-                data.get('max_price_since_entry'),
-                data.get('min_price_since_entry'),
-                data.get('price_15m_later'),
-                data.get('price_30m_later'),
-                data.get('time_to_max_gain_hours'),
-                data.get('time_to_rug_hours'),
-                data.get('max_gain_timestamp'),
-            )
-
-            if self.db_type == 'postgres':
-                self._execute('''
-                    INSERT INTO performance_tracking (
-                        call_id, last_updated, price_1h_later, price_24h_later,
-                        price_7d_later, price_30d_later, current_mcap, current_liquidity,
-                        max_gain_observed, max_loss_observed, token_still_alive, rug_pull_occurred,
-                        checkpoint_type, max_price_since_entry, min_price_since_entry,
-                        price_15m_later, price_30m_later, time_to_max_gain_hours,
-                        time_to_rug_hours, max_gain_timestamp
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    RETURNING tracking_id
-                ''', params)
-                result = self._fetchone()
-                tracking_id = result['tracking_id']
-            else:
-                self._execute('''
-                    INSERT INTO performance_tracking (
-                        call_id, last_updated, price_1h_later, price_24h_later,
-                        price_7d_later, price_30d_later, current_mcap, current_liquidity,
-                        max_gain_observed, max_loss_observed, token_still_alive, rug_pull_occurred,
-                        checkpoint_type, max_price_since_entry, min_price_since_entry,
-                        price_15m_later, price_30m_later, time_to_max_gain_hours,
-                        time_to_rug_hours, max_gain_timestamp
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', params)
-                tracking_id = self.cursor.lastrowid
-
-        self.conn.commit()
-        return tracking_id
-
-    def insert_performance_history(self, call_id: int, data: Dict[str, Any]) -> int:
-        """Insert a time-series snapshot for a tracked token."""
-        timestamp = datetime.now().isoformat()
-
-        token_alive = self._to_bool(data.get('token_still_alive'))
-        rug_occurred = self._to_bool(data.get('rug_pull_occurred'))
-
-        params = (
+        values = dict(data)
+        values['token_still_alive'] = self._to_bool(data.get('token_still_alive'))
+        values['rug_pull_occurred'] = self._to_bool(data.get('rug_pull_occurred'))
+        # Only bind the columns this update actually carries; a skipped
+        # column keeps its stored value exactly as COALESCE(NULL, old) would
+        columns = tuple(col for col in _PERFORMANCE_COLUMNS
+                        if col in _PERFORMANCE_ALWAYS_BOUND or values.get(col) is not None)
+        return columns, (call_id, timestamp, *(values.get(col) for col in columns))
+
+    def _history_params(self, call_id: int, data: Dict[str, Any], timestamp: str) -> tuple:
+        """Return the parameters of one performance_history INSERT."""
+        return (
             call_id,
             timestamp,
             data.get('decision_status'),
@@ -689,101 +925,281 @@ class MemecoinDatabase:
             data.get('price_change_pct'),
             data.get('liquidity_change_pct'),
             data.get('market_cap_change_pct'),
-            token_alive,
-            rug_occurred,
+            self._to_bool(data.get('token_still_alive')),
+            self._to_bool(data.get('rug_pull_occurred')),
         )
 
-        if self.db_type == 'postgres':
-            self._execute('''
-                INSERT INTO performance_history (
-                    call_id, timestamp, decision_status, reference_price,
-                    price_usd, liquidity_usd, total_liquidity, market_cap,
-                    gain_loss_pct, price_change_pct, liquidity_change_pct, market_cap_change_pct,
-                    token_still_alive, rug_pull_occurred
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                RETURNING history_id
-            ''', params)
-            result = self._fetchone()
-            self.conn.commit()
-            return result['history_id']
-        else:
-            self._execute('''
-                INSERT INTO performance_history (
-                    call_id, timestamp, decision_status, reference_price,
-                    price_usd, liquidity_usd, total_liquidity, market_cap,
-                    gain_loss_pct, price_change_pct, liquidity_change_pct, market_cap_change_pct,
-                    token_still_alive, rug_pull_occurred
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', params)
-            self.conn.commit()
-            return self.cursor.lastrowid
+    def insert_or_update_performance(self, call_id: int, data: Dict[str, Any]) -> int:
+        """Insert or update performance tracking data with a single UPSERT."""
+        columns, params = self._performance_params(call_id, data, _now().isoformat())
+
+        with self.transaction():
+            # lastrowid is not updated on the DO UPDATE path, so read RETURNING
+            if self._has_returning:
+                self._execute(_performance_upsert_sql(columns), params)
+                return self._fetchone()['tracking_id']
+            self._execute(_performance_upsert_sql(columns, returning=False), params)
+            self._execute(
+                'SELECT tracking_id FROM performance_tracking WHERE call_id = ?', (call_id,)
+            )
+            return self._fetchone()['tracking_id']
+
+    def insert_performance_history(self, call_id: int, data: Dict[str, Any]) -> int:
+        """Insert a time-series snapshot for a tracked token."""
+        params = self._history_params(call_id, data, _now().isoformat())
+
+        with self.transaction():
+            if self.db_type == 'postgres':
+                self._execute(_SQL_INSERT_HISTORY_RETURNING, params)
+                return self._fetchone()['history_id']
+            else:
+                self._execute(_SQL_INSERT_HISTORY, params)
+                return self.cursor.lastrowid
+
+    def write_performance_batch(self, updates: List[tuple[int, Dict[str, Any]]],
+                                history: List[tuple[int, Dict[str, Any]]]) -> None:
+        """Apply many performance UPSERTs and history INSERTs in one transaction.
+
+        Same effect as calling insert_or_update_performance() and
+        insert_performance_history() per (call_id, data) pair, but sent with
+        executemany(): one statement per UPSERT shape plus one for all
+        history rows. Updates are grouped by shape, so give each call_id at
+        most one entry in updates.
+        """
+        timestamp = _now().isoformat()
+        by_shape: Dict[tuple[str, ...], List[tuple]] = {}
+        for call_id, data in updates:
+            columns, params = self._performance_params(call_id, data, timestamp)
+            by_shape.setdefault(columns, []).append(params)
+        history_params = [self._history_params(call_id, data, timestamp) for call_id, data in history]
+
+        with self.transaction():
+            for columns, params_seq in by_shape.items():
+                self._executemany(_performance_upsert_sql(columns, returning=False), params_seq)
+            if history_params:
+                self._executemany(_SQL_INSERT_HISTORY, history_params)
+
+    def get_performance(self, call_id: int) -> Optional[Dict[str, Any]]:
+        """Get the performance_tracking row for a call, if any."""
+        return self._query_one(
+            'SELECT * FROM performance_tracking WHERE call_id = ?', (call_id,)
+        )
+
+    def get_performance_bulk(self, call_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """get_performance() for many calls at once, keyed by call_id."""
+        rows = {}
+        for start in range(0, len(call_ids), _BULK_READ_CHUNK):
+            chunk = call_ids[start:start + _BULK_READ_CHUNK]
+            for row in self._query(
+                f'SELECT * FROM performance_tracking WHERE call_id IN ({self._placeholders(len(chunk))})',
+                tuple(chunk),
+            ):
+                rows[row['call_id']] = row
+        return rows
+
+    def get_latest_performance_history_bulk(self, call_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """get_latest_performance_history() for many calls at once, keyed by call_id."""
+        rows = {}
+        for start in range(0, len(call_ids), _BULK_READ_CHUNK):
+            chunk = call_ids[start:start + _BULK_READ_CHUNK]
+            for row in self._query(f'''
+                SELECT * FROM (
+                    SELECT h.*, ROW_NUMBER() OVER (
+                        PARTITION BY call_id ORDER BY timestamp DESC
+                    ) AS rn
+                    FROM performance_history h
+                    WHERE call_id IN ({self._placeholders(len(chunk))})
+                ) latest
+                WHERE rn = 1
+            ''', tuple(chunk)):
+                row.pop('rn')
+                rows[row['call_id']] = row
+        return rows
 
     def get_latest_performance_history(self, call_id: int) -> Optional[Dict[str, Any]]:
         """Get the most recent performance history snapshot for a call."""
-        self._execute('''
+        return self._query_one('''
             SELECT *
             FROM performance_history
             WHERE call_id = ?
             ORDER BY timestamp DESC
             LIMIT 1
         ''', (call_id,))
-        return self._fetchone()
 
     def update_source_performance(self, source_name: str) -> None:
         """Calculate and update source performance statistics for an individual source."""
-        timestamp = datetime.now().isoformat()
-        source_name = self.normalize_source_name(source_name)
+        self.update_source_performance_bulk([source_name])
+
+    def update_source_performance_bulk(self, source_names: List[str]) -> None:
+        """Recalculate stats for several sources in a single transaction.
+
+        One commit for the whole batch instead of one per source, and the
+        sources' calls are read in chunked queries rather than one each.
+        """
+        if not source_names:
+            return
+
+        timestamp = _now().isoformat()
+        with self.transaction():
+            global_avg_gain, global_std = self._global_gain_stats()
+            calls_by_source = self._fetch_calls_for_sources(
+                [self.normalize_source_name(name) for name in source_names]
+            )
+            rows = [
+                self._source_stats_row(name, calls, timestamp, global_avg_gain, global_std)
+                for name, calls in calls_by_source.items()
+            ]
+            self._upsert_source_performance(rows)
+
+    def recalculate_all_source_performance(self) -> int:
+        """Recalculate stats for every individual source found in calls_received.
 
+        Reads all calls in one joined query, groups them by source in Python
+        (the source column holds comma-separated lists, so SQL GROUP BY can't
+        split it), and writes every row with a single executemany UPSERT.
+
+        Returns:
+            Number of sources updated
+        """
+        timestamp = _now().isoformat()
+        calls = self._query(f'''
+            {_SOURCE_CALLS_SELECT}
+            WHERE c.source IS NOT NULL
+        ''')
+        calls_by_source: Dict[str, List[Dict[str, Any]]] = {}
+        for call in calls:
+            for source_name in {self.normalize_source_name(s)
+                                for s in call['source'].split(',') if s.strip()}:
+                calls_by_source.setdefault(source_name, []).append(call)
+
+        if not calls_by_source:
+            return 0
+
+        with self.transaction():
+            global_avg_gain, global_std = self._global_gain_stats()
+            rows = [
+                self._source_stats_row(name, calls, timestamp, global_avg_gain, global_std)
+                for name, calls in sorted(calls_by_source.items())
+            ]
+            self._upsert_source_performance(rows)
+        return len(rows)
+
+    def _fetch_calls_for_sources(self, source_names: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Fetch joined call/decision/performance rows for many normalized sources.
+
+        A call matches a source named anywhere in its comma-separated source
+        list. One query per _SOURCE_MATCH_CHUNK sources instead of one per
+        source; rows are grouped by source in Python.
+        """
+        calls_by_source: Dict[str, List[Dict[str, Any]]] = {name: [] for name in source_names}
+        names = sorted(calls_by_source)
+        for start in range(0, len(names), _SOURCE_MATCH_CHUNK):
+            chunk = names[start:start + _SOURCE_MATCH_CHUNK]
+            conditions, params = [], []
+            for name in chunk:
+                conditions.append('lower(c.source) = ? OR lower(c.source) LIKE ? '
+                                  'OR lower(c.source) LIKE ? OR lower(c.source) LIKE ?')
+                params.extend((name, f'{name},%', f'%, {name}', f'%, {name},%'))
+            self._execute(f'''
+                {_SOURCE_CALLS_SELECT}
+                WHERE {' OR '.join(conditions)}
+            ''', tuple(params))
+            # Only credit sources from this chunk: a call listing sources from
+            # several chunks comes back once per chunk
+            wanted = set(chunk)
+            for call in self._fetchall():
+                for name in {self.normalize_source_name(s)
+                             for s in call['source'].split(',') if s.strip()} & wanted:
+                    calls_by_source[name].append(call)
+        return calls_by_source
+
+    def _global_gain_stats(self) -> tuple[float, float | None]:
+        """Return (mean, population std dev) of positive max gains across all calls.
+
+        Std dev is None when fewer than two gains exist.
+        """
         self._execute('''
-            SELECT
-                c.call_id,
-                c.timestamp_received,
-                d.my_decision,
-                d.entry_price,
-                d.actual_exit_price,
-                p.max_gain_observed,
-                p.rug_pull_occurred,
-                p.time_to_max_gain_hours
-            FROM calls_received c
-            LEFT JOIN my_decisions d ON c.call_id = d.call_id
-            LEFT JOIN performance_tracking p ON c.call_id = p.call_id
-            WHERE lower(c.source) = ?
-               OR lower(c.source) LIKE ?
-               OR lower(c.source) LIKE ?
-               OR lower(c.source) LIKE ?
-        ''', (source_name, f'{source_name},%', f'%, {source_name}', f'%, {source_name},%'))
-
-        calls = self._fetchall()
+            SELECT p.max_gain_observed
+            FROM performance_tracking p
+            WHERE p.max_gain_observed IS NOT NULL AND p.max_gain_observed > 0
+        ''')
+        all_global_gains = [row['max_gain_observed'] for row in self._fetchall()]
+        if not all_global_gains:
+            return 0.0, None
+        global_avg = fmean(all_global_gains)
+        if len(all_global_gains) < 2:
+            return global_avg, None
+        global_std = math.sqrt(fmean((x - global_avg) ** 2 for x in all_global_gains))
+        return global_avg, global_std
+
+    def _source_stats_row(self, source_name: str, calls: List[Dict[str, Any]], timestamp: str,
+                          global_avg_gain: float, global_std: float | None) -> tuple:
+        """Compute the source_performance UPSERT parameters for one source."""
         total_calls = len(calls)
-        calls_traded = sum(1 for c in calls if c['my_decision'] == 'TRADE')
 
-        gains = [c['max_gain_observed'] for c in calls if c['max_gain_observed'] is not None and c['max_gain_observed'] > 0]
-        avg_max_gain = sum(gains) / len(gains) if gains else 0.0
-
-        # Handle both BOOLEAN (PostgreSQL) and TEXT 'yes'/'no' (SQLite)
-        rugs = sum(1 for c in calls if self._from_bool(c['rug_pull_occurred']))
-        rug_rate = rugs / total_calls if total_calls > 0 else 0.0
+        # One pass over the joined rows accumulates every counter the
+        # metrics below need, instead of a separate scan per metric.
+        cutoff = _now() - timedelta(days=30)
+        cutoff_str = cutoff.isoformat()
 
-        traded_calls = [c for c in calls if c['my_decision'] == 'TRADE']
-        exited_trades = [c for c in traded_calls
-                        if c['actual_exit_price'] is not None
-                        and c['actual_exit_price'] > 0
-                        and c['entry_price'] is not None]
-        wins = sum(1 for c in exited_trades if c['actual_exit_price'] > c['entry_price'])
-        win_rate = wins / len(exited_trades) if exited_trades else 0.0
+        def _is_recent(ts) -> bool:
+            if ts is None:
+                return False
+            # PostgreSQL may return datetime objects (possibly timezone-aware), SQLite returns strings
+            if isinstance(ts, datetime):
+                # Strip timezone info for comparison if needed
+                ts_naive = ts.replace(tzinfo=None) if ts.tzinfo else ts
+                return ts_naive >= cutoff
+            return str(ts) >= cutoff_str
 
-        hits = sum(1 for c in calls if c['max_gain_observed'] and c['max_gain_observed'] >= HIT_THRESHOLD)
+        calls_traded = rugs = exited = wins = hits = 0
+        recent_count = recent_hits = 0
+        gains: List[float] = []
+        all_gains: List[float] = []
+        time_to_max_values: List[float] = []
+        for c in calls:
+            max_gain = c['max_gain_observed']
+            is_hit = bool(max_gain) and max_gain >= HIT_THRESHOLD
+
+            if c['my_decision'] == 'TRADE':
+                calls_traded += 1
+                exit_price = c['actual_exit_price']
+                if exit_price is not None and exit_price > 0 and c['entry_price'] is not None:
+                    exited += 1
+                    if exit_price > c['entry_price']:
+                        wins += 1
+
+            if max_gain is not None:
+                all_gains.append(max_gain)
+                if max_gain > 0:
+                    gains.append(max_gain)
+
+            # Handle both BOOLEAN (PostgreSQL) and TEXT 'yes'/'no' (SQLite)
+            if self._from_bool(c['rug_pull_occurred']):
+                rugs += 1
+            if is_hit:
+                hits += 1
+
+            time_to_max = c.get('time_to_max_gain_hours')
+            if time_to_max is not None:
+                time_to_max_values.append(time_to_max)
+
+            if _is_recent(c.get('timestamp_received')):
+                recent_count += 1
+                if is_hit:
+                    recent_hits += 1
+
+        avg_max_gain = fmean(gains) if gains else 0.0
+        rug_rate = rugs / total_calls if total_calls > 0 else 0.0
+        win_rate = wins / exited if exited else 0.0
         hit_rate = hits / total_calls if total_calls > 0 else 0.0
 
         # --- NEW: avg_time_to_max_gain_hours ---
-        time_to_max_values = [c['time_to_max_gain_hours'] for c in calls
-                              if c.get('time_to_max_gain_hours') is not None]
-        avg_time_to_max_gain_hours = (sum(time_to_max_values) / len(time_to_max_values)) if time_to_max_values else None
+        avg_time_to_max_gain_hours = fmean(time_to_max_values) if time_to_max_values else None
 
         # --- NEW: median_max_gain ---
-        all_gains = sorted([c['max_gain_observed'] for c in calls
-                           if c['max_gain_observed'] is not None])
         if all_gains:
+            all_gains.sort()
             mid = len(all_gains) // 2
             if len(all_gains) % 2 == 0:
                 median_max_gain = (all_gains[mid - 1] + all_gains[mid]) / 2.0
@@ -793,59 +1209,16 @@ class MemecoinDatabase:
             median_max_gain = None
 
         # --- NEW: baseline_alpha (source avg - global avg) ---
-        self._execute('''
-            SELECT AVG(p.max_gain_observed) as global_avg
-            FROM performance_tracking p
-            WHERE p.max_gain_observed IS NOT NULL AND p.max_gain_observed > 0
-        ''')
-        global_result = self._fetchone()
-        global_avg_gain = global_result['global_avg'] if global_result and global_result['global_avg'] else 0.0
         baseline_alpha = avg_max_gain - global_avg_gain if avg_max_gain > 0 else None
 
         # --- NEW: confidence_score (z-test based) ---
         confidence_score = None
-        if gains and len(gains) >= 2:
-            source_mean = avg_max_gain
-            n = len(gains)
-            # Get global std dev
-            self._execute('''
-                SELECT AVG(p.max_gain_observed) as g_avg
-                FROM performance_tracking p
-                WHERE p.max_gain_observed IS NOT NULL AND p.max_gain_observed > 0
-            ''')
-            g_result = self._fetchone()
-            g_avg = g_result['g_avg'] if g_result and g_result['g_avg'] else 0.0
-
-            # Calculate global std dev
-            self._execute('''
-                SELECT p.max_gain_observed
-                FROM performance_tracking p
-                WHERE p.max_gain_observed IS NOT NULL AND p.max_gain_observed > 0
-            ''')
-            all_global_gains = [row['max_gain_observed'] for row in self._fetchall()]
-            if all_global_gains and len(all_global_gains) >= 2:
-                global_std = math.sqrt(sum((x - g_avg) ** 2 for x in all_global_gains) / len(all_global_gains))
-                if global_std > 0:
-                    z = (source_mean - g_avg) / (global_std / math.sqrt(n))
-                    confidence_score = min(max(z / 3.0, 0.0), 1.0)
+        if gains and len(gains) >= 2 and global_std:
+            z = (avg_max_gain - global_avg_gain) / (global_std / math.sqrt(len(gains)))
+            confidence_score = min(max(z / 3.0, 0.0), 1.0)
 
         # --- NEW: recent_hit_rate (last 30 days) ---
-        cutoff = datetime.now() - timedelta(days=30)
-        cutoff_str = cutoff.isoformat()
-
-        def _is_recent(ts) -> bool:
-            if ts is None:
-                return False
-            # PostgreSQL may return datetime objects (possibly timezone-aware), SQLite returns strings
-            if isinstance(ts, datetime):
-                # Strip timezone info for comparison if needed
-                ts_naive = ts.replace(tzinfo=None) if ts.tzinfo else ts
-                return ts_naive >= cutoff
-            return str(ts) >= cutoff_str
-
-        recent_calls = [c for c in calls if _is_recent(c.get('timestamp_received'))]
-        recent_hits = sum(1 for c in recent_calls if c['max_gain_observed'] and c['max_gain_observed'] >= HIT_THRESHOLD)
-        recent_hit_rate = recent_hits / len(recent_calls) if recent_calls else None
+        recent_hit_rate = recent_hits / recent_count if recent_count else None
 
         # --- NEW: sample_size ---
         sample_size = total_calls
@@ -865,123 +1238,109 @@ class MemecoinDatabase:
             if avg_max_gain > 3.0:
                 tier = 'A'
 
-        upsert_params = (
+        return (
             source_name, total_calls, calls_traded, win_rate, avg_max_gain,
             rug_rate, hit_rate, tier, timestamp,
             avg_time_to_max_gain_hours, median_max_gain, baseline_alpha,
             confidence_score, recent_hit_rate, sample_size,
         )
 
-        if self.db_type == 'postgres':
-            self._execute('''
-                INSERT INTO source_performance
-                (source_name, total_calls, calls_traded, win_rate, avg_max_gain, rug_rate, hit_rate, tier, last_updated,
-                 avg_time_to_max_gain_hours, median_max_gain, baseline_alpha, confidence_score, recent_hit_rate, sample_size)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(source_name) DO UPDATE SET
-                    total_calls = EXCLUDED.total_calls,
-                    calls_traded = EXCLUDED.calls_traded,
-                    win_rate = EXCLUDED.win_rate,
-                    avg_max_gain = EXCLUDED.avg_max_gain,
-                    rug_rate = EXCLUDED.rug_rate,
-                    hit_rate = EXCLUDED.hit_rate,
-                    tier = EXCLUDED.tier,
-                    last_updated = EXCLUDED.last_updated,
-                    avg_time_to_max_gain_hours = EXCLUDED.avg_time_to_max_gain_hours,
-                    median_max_gain = EXCLUDED.median_max_gain,
-                    baseline_alpha = EXCLUDED.baseline_alpha,
-                    confidence_score = EXCLUDED.confidence_score,
-                    recent_hit_rate = EXCLUDED.recent_hit_rate,
-                    sample_size = EXCLUDED.sample_size
-            ''', upsert_params)
-        else:
-            self._execute('''
-                INSERT INTO source_performance
-                (source_name, total_calls, calls_traded, win_rate, avg_max_gain, rug_rate, hit_rate, tier, last_updated,
-                 avg_time_to_max_gain_hours, median_max_gain, baseline_alpha, confidence_score, recent_hit_rate, sample_size)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(source_name) DO UPDATE SET
-                    total_calls = excluded.total_calls,
-                    calls_traded = excluded.calls_traded,
-                    win_rate = excluded.win_rate,
-                    avg_max_gain = excluded.avg_max_gain,
-                    rug_rate = excluded.rug_rate,
-                    hit_rate = excluded.hit_rate,
-                    tier = excluded.tier,
-                    last_updated = excluded.last_updated,
-                    avg_time_to_max_gain_hours = excluded.avg_time_to_max_gain_hours,
-                    median_max_gain = excluded.median_max_gain,
-                    baseline_alpha = excluded.baseline_alpha,
-                    confidence_score = excluded.confidence_score,
-                    recent_hit_rate = excluded.recent_hit_rate,
-                    sample_size = excluded.sample_size
-            ''', upsert_params)
-
-        self.conn.commit()
+    def _upsert_source_performance(self, rows: List[tuple]) -> None:
+        """Write source_performance rows with one executemany UPSERT (no commit)."""
+        if not rows:
+            return
+        # EXCLUDED/excluded is case-insensitive in both PostgreSQL and SQLite
+        self._executemany('''
+            INSERT INTO source_performance
+            (source_name, total_calls, calls_traded, win_rate, avg_max_gain, rug_rate, hit_rate, tier, last_updated,
+             avg_time_to_max_gain_hours, median_max_gain, baseline_alpha, confidence_score, recent_hit_rate, sample_size)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(source_name) DO UPDATE SET
+                total_calls = excluded.total_calls,
+                calls_traded = excluded.calls_traded,
+                win_rate = excluded.win_rate,
+                avg_max_gain = excluded.avg_max_gain,
+                rug_rate = excluded.rug_rate,
+                hit_rate = excluded.hit_rate,
+                tier = excluded.tier,
+                last_updated = excluded.last_updated,
+                avg_time_to_max_gain_hours = excluded.avg_time_to_max_gain_hours,
+                median_max_gain = excluded.median_max_gain,
+                baseline_alpha = excluded.baseline_alpha,
+                confidence_score = excluded.confidence_score,
+                recent_hit_rate = excluded.recent_hit_rate,
+                sample_size = excluded.sample_size
+        ''', rows)
 
     def cleanup_combined_sources(self) -> int:
         """Remove combined source entries from source_performance table."""
-        self._execute('''
-            SELECT source_name FROM source_performance
-            WHERE source_name LIKE '%,%'
-        ''')
-        combined_sources = [row['source_name'] for row in self._fetchall()]
+        with self.transaction():
+            self._execute('''
+                SELECT source_name FROM source_performance
+                WHERE source_name LIKE '%,%'
+            ''')
+            combined_sources = [row['source_name'] for row in self._fetchall()]
 
-        if not combined_sources:
-            return 0
+            if not combined_sources:
+                return 0
 
-        # Batch delete instead of N+1 pattern - single query for all deletions
-        placeholders = self._placeholders(len(combined_sources))
-        self._execute(
-            f'DELETE FROM source_performance WHERE source_name IN ({placeholders})',
-            tuple(combined_sources)
-        )
+            # Batch delete instead of N+1 pattern - single query for all deletions
+            placeholders = self._placeholders(len(combined_sources))
+            self._execute(
+                f'DELETE FROM source_performance WHERE source_name IN ({placeholders})',
+                tuple(combined_sources)
+            )
 
-        self.conn.commit()
         db_logger.info(f"Cleaned up {len(combined_sources)} combined source entries")
         return len(combined_sources)
 
     def get_all_sources(self) -> List[Dict[str, Any]]:
-        """Get all source performance statistics."""
-        self._execute('''
-            SELECT * FROM source_performance
-            ORDER BY tier ASC, avg_max_gain DESC
-        ''')
-        return self._fetchall()
+        """Get all source performance statistics.
+
+        Only the columns the CLI and web views display are selected, and
+        SQLite rows are zipped against the fixed column list rather than
+        going through sqlite3.Row's per-key lookups.
+        """
+        with self._read_cursor() as cur:
+            cur.execute(f'''
+                SELECT {', '.join(_SOURCE_STATS_COLUMNS)} FROM source_performance
+                ORDER BY tier ASC, avg_max_gain DESC
+            ''')
+            if self.db_type == 'postgres':
+                # RealDictCursor rows are already dicts
+                return cur.fetchall()
+            return [dict(zip(_SOURCE_STATS_COLUMNS, row)) for row in cur.fetchall()]
 
     def get_call_by_address(self, contract_address: str) -> Optional[Dict[str, Any]]:
         """Get call information by contract address."""
-        self._execute(
+        return self._query_one(
             'SELECT * FROM calls_received WHERE contract_address = ?',
             (contract_address,)
         )
-        return self._fetchone()
 
     def insert_wallet(self, wallet_address: str, wallet_name: str, notes: str = "") -> int:
         """Insert a new tracked wallet."""
-        timestamp = datetime.now().isoformat()
+        timestamp = _now().isoformat()
 
         try:
-            if self.db_type == 'postgres':
-                self._execute('''
-                    INSERT INTO tracked_wallets
-                    (wallet_address, wallet_name, notes, date_added)
-                    VALUES (?, ?, ?, ?)
-                    RETURNING wallet_id
-                ''', (wallet_address, wallet_name, notes, timestamp))
-                result = self._fetchone()
-                self.conn.commit()
-                return result['wallet_id']
-            else:
-                self._execute('''
-                    INSERT INTO tracked_wallets
-                    (wallet_address, wallet_name, notes, date_added)
-                    VALUES (?, ?, ?, ?)
-                ''', (wallet_address, wallet_name, notes, timestamp))
-                self.conn.commit()
-                return self.cursor.lastrowid
+            with self.transaction():
+                if self.db_type == 'postgres':
+                    self._execute('''
+                        INSERT INTO tracked_wallets
+                        (wallet_address, wallet_name, notes, date_added)
+                        VALUES (?, ?, ?, ?)
+                        RETURNING wallet_id
+                    ''', (wallet_address, wallet_name, notes, timestamp))
+                    return self._fetchone()['wallet_id']
+                else:
+                    self._execute('''
+                        INSERT INTO tracked_wallets
+                        (wallet_address, wallet_name, notes, date_added)
+                        VALUES (?, ?, ?, ?)
+                    ''', (wallet_address, wallet_name, notes, timestamp))
+                    return self.cursor.lastrowid
         except Exception as e:
-            self.conn.rollback()
+            # transaction() has already rolled back
             error_str = str(e).lower()
             if 'unique' in error_str or 'duplicate' in error_str:
                 db_logger.warning(f"Wallet {wallet_address} already exists")
@@ -991,28 +1350,26 @@ class MemecoinDatabase:
 
     def remove_wallet(self, wallet_address: str) -> bool:
         """Remove a tracked wallet."""
-        self._execute(
-            'DELETE FROM tracked_wallets WHERE wallet_address = ?',
-            (wallet_address,)
-        )
-        self.conn.commit()
-        return self.cursor.rowcount > 0
+        with self.transaction():
+            self._execute(
+                'DELETE FROM tracked_wallets WHERE wallet_address = ?',
+                (wallet_address,)
+            )
+            return self.cursor.rowcount > 0
 
     def get_all_wallets(self) -> List[Dict[str, Any]]:
         """Get all tracked wallets."""
-        self._execute('''
+        return self._query('''
             SELECT * FROM tracked_wallets
             ORDER BY tier ASC, avg_gain DESC
         ''')
-        return self._fetchall()
 
     def get_wallet_by_address(self, wallet_address: str) -> Optional[Dict[str, Any]]:
         """Get a specific tracked wallet."""
-        self._execute(
+        return self._query_one(
             'SELECT * FROM tracked_wallets WHERE wallet_address = ?',
             (wallet_address,)
         )
-        return self._fetchone()
 
     def update_wallet_performance(self, wallet_address: str, win_rate: float,
                                   avg_gain: float, total_buys: int) -> None:
@@ -1026,15 +1383,15 @@ class MemecoinDatabase:
         else:
             tier = 'C'
 
-        self._execute('''
-            UPDATE tracked_wallets SET
-                win_rate = ?,
-                avg_gain = ?,
-                total_tracked_buys = ?,
-                tier = ?
-            WHERE wallet_address = ?
-        ''', (win_rate, avg_gain, total_buys, tier, wallet_address))
-        self.conn.commit()
+        with self.transaction():
+            self._execute('''
+                UPDATE tracked_wallets SET
+                    win_rate = ?,
+                    avg_gain = ?,
+                    total_tracked_buys = ?,
+                    tier = ?
+                WHERE wallet_address = ?
+            ''', (win_rate, avg_gain, total_buys, tier, wallet_address))
 
     def import_wallets_from_list(self, wallets: List[Dict[str, str]]) -> int:
         """Import multiple wallets from a list."""
@@ -1051,6 +1408,10 @@ class MemecoinDatabase:
 
     def close(self) -> None:
         """Close database connection or return to pool."""
+        if self._read_pool:
+            for reader in self._read_pool:
+                reader.close()
+            self._read_pool.clear()
         if self._using_pool:
             pool = get_pg_pool()
             if pool:
@@ -6,7 +6,11 @@ Pure display logic extracted from analyzer.py - no database or API calls.
 
 from __future__ import annotations
 
+import io
 import logging
+import math
+import sys
+from bisect import bisect_left, bisect_right
 from datetime import datetime
 from typing import Any
 
@@ -34,6 +38,31 @@ SAFETY_THRESHOLDS = {
     'RISKY': 4.0,
 }
 
+# Sorted lower bounds and the rating for each bucket, lowest first, so a
+# single bisect picks the rating (a score equal to a bound gets the higher one).
+_RATING_BOUNDS = (
+    SAFETY_THRESHOLDS['RISKY'],
+    SAFETY_THRESHOLDS['MODERATE'],
+    SAFETY_THRESHOLDS['GOOD'],
+)
+_RATINGS: tuple[SafetyRating, ...] = (
+    ("DANGEROUS", "🔴"),
+    ("RISKY", "🟠"),
+    ("MODERATE", "🟡"),
+    ("GOOD", "🟢"),
+)
+
+# Sell tax % upper bounds (a tax equal to a bound stays in the lower bucket)
+_TAX_BOUNDS = (5, 10)
+_TAX_EMOJI = ("✅", "🟡", "🔴")
+
+# Volume/liquidity ratio upper bounds, same convention as the tax ladder
+_VOL_LIQ_BOUNDS = (0.3, 1.0, 2.0)
+_VOL_LIQ_EMOJI = ("📉", "➡️", "📊", "🔥")
+
+# Indexed by sign(x) + 1: negative, zero, positive
+_SIGN_EMOJI = ("📉", "➡️", "📈")
+
 HONEYPOT_EMOJI = {
     'HIGH': '🚨',
     'MEDIUM': '⚠️',
@@ -86,14 +115,22 @@ def get_safety_rating(score: float) -> SafetyRating:
     Returns:
         Tuple of (rating_text, emoji)
     """
-    if score >= SAFETY_THRESHOLDS['GOOD']:
-        return "GOOD", "🟢"
-    elif score >= SAFETY_THRESHOLDS['MODERATE']:
-        return "MODERATE", "🟡"
-    elif score >= SAFETY_THRESHOLDS['RISKY']:
-        return "RISKY", "🟠"
-    else:
-        return "DANGEROUS", "🔴"
+    # bisect would rank NaN above every bound; a missing score is DANGEROUS
+    if score is None or math.isnan(score):
+        return _RATINGS[0]
+    return _RATINGS[bisect_right(_RATING_BOUNDS, score)]
+
+
+def sign_emoji(value: float) -> str:
+    """Get the up/down/flat emoji for a signed change.
+
+    Args:
+        value: Percentage change (any sign)
+
+    Returns:
+        Emoji string
+    """
+    return _SIGN_EMOJI[(value > 0) - (value < 0) + 1]
 
 
 def format_currency(value: float | None) -> str:
@@ -154,7 +191,7 @@ def print_menu() -> None:
     print()
 
 
-def display_analysis(symbol: str, name: str, source: str, data: TokenData) -> None:
+def display_analysis(symbol: str, name: str, source: str, data: TokenData) -> str:
     """Display the analysis results.
 
     Args:
@@ -162,66 +199,70 @@ def display_analysis(symbol: str, name: str, source: str, data: TokenData) -> No
         name: Token name (e.g., "Pepe Coin")
         source: Source of the call
         data: Token data dictionary from fetcher
+
+    Returns:
+        The rendered report, which is also written to stdout in one call
     """
+    buf = io.StringIO()
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
 
-    print("\n" + "━"*60)
-    print(f"🪙  TOKEN: ${symbol} ({name})")
-    print(f"📍 Source: {source}")
-    print(f"⏰ Analyzed: {timestamp}")
-    print("━"*60)
+    print("\n" + "━"*60, file=buf)
+    print(f"🪙  TOKEN: ${symbol} ({name})", file=buf)
+    print(f"📍 Source: {source}", file=buf)
+    print(f"⏰ Analyzed: {timestamp}", file=buf)
+    print("━"*60, file=buf)
 
     # Safety checks
     safety_score = data.get('safety_score', 0)
     rating, emoji = get_safety_rating(safety_score)
 
-    print(f"\n🔒 SAFETY CHECKS:")
-    print(f"{emoji} Safety Score: {safety_score:.1f}/10 ({rating})")
+    print(f"\n🔒 SAFETY CHECKS:", file=buf)
+    print(f"{emoji} Safety Score: {safety_score:.1f}/10 ({rating})", file=buf)
 
     # Honeypot risk indicator
     honeypot_risk = data.get('honeypot_risk', 'UNKNOWN')
     hp_emoji = HONEYPOT_EMOJI.get(honeypot_risk, '❓')
     if honeypot_risk == 'HIGH':
-        print(f"{hp_emoji} Honeypot Risk: HIGH - May not be sellable!")
+        print(f"{hp_emoji} Honeypot Risk: HIGH - May not be sellable!", file=buf)
     elif honeypot_risk == 'MEDIUM':
-        print(f"{hp_emoji}  Honeypot Risk: MEDIUM - Proceed with caution")
+        print(f"{hp_emoji}  Honeypot Risk: MEDIUM - Proceed with caution", file=buf)
     elif honeypot_risk == 'LOW':
-        print(f"{hp_emoji} Honeypot Risk: LOW")
+        print(f"{hp_emoji} Honeypot Risk: LOW", file=buf)
 
     mint_revoked = data.get('mint_authority_revoked')
     freeze_revoked = data.get('freeze_authority_revoked')
 
     if mint_revoked == 1:
-        print("✅ Mint Authority: REVOKED")
+        print("✅ Mint Authority: REVOKED", file=buf)
     elif mint_revoked == 0:
-        print("❌ Mint Authority: ACTIVE")
+        print("❌ Mint Authority: ACTIVE", file=buf)
     else:
-        print("⚠️  Mint Authority: UNKNOWN")
+        print("⚠️  Mint Authority: UNKNOWN", file=buf)
 
     if freeze_revoked == 1:
-        print("✅ Freeze Authority: REVOKED")
+        print("✅ Freeze Authority: REVOKED", file=buf)
     elif freeze_revoked == 0:
-        print("❌ Freeze Authority: ACTIVE")
+        print("❌ Freeze Authority: ACTIVE", file=buf)
     else:
-        print("⚠️  Freeze Authority: UNKNOWN")
+        print("⚠️  Freeze Authority: UNKNOWN", file=buf)
 
     # Token taxes
     buy_tax = data.get('estimated_buy_tax', 0)
     sell_tax = data.get('estimated_sell_tax', 0)
     if buy_tax > 0 or sell_tax > 0:
-        tax_emoji = "🔴" if sell_tax > 10 else "🟡" if sell_tax > 5 else "✅"
-        print(f"{tax_emoji} Token Taxes: Buy {buy_tax:.0f}% / Sell {sell_tax:.0f}%")
+        tax_emoji = _TAX_EMOJI[bisect_left(_TAX_BOUNDS, sell_tax)]
+        print(f"{tax_emoji} Token Taxes: Buy {buy_tax:.0f}% / Sell {sell_tax:.0f}%", file=buf)
 
     top_holder = data.get('top_holder_percent')
     if top_holder is not None:
         if top_holder > 20:
-            print(f"🔴 Top Holder: {top_holder:.1f}% (HIGH RISK)")
+            print(f"🔴 Top Holder: {top_holder:.1f}% (HIGH RISK)", file=buf)
         elif top_holder > 15:
-            print(f"🟡 Top Holder: {top_holder:.1f}% (moderate risk)")
+            print(f"🟡 Top Holder: {top_holder:.1f}% (moderate risk)", file=buf)
         else:
-            print(f"✅ Top Holder: {top_holder:.1f}% (acceptable)")
+            print(f"✅ Top Holder: {top_holder:.1f}% (acceptable)", file=buf)
     else:
-        print("⚠️  Top Holder: N/A")
+        print("⚠️  Top Holder: N/A", file=buf)
 
     # Holder distribution
     holder_concentration = data.get('holder_concentration')
@@ -229,31 +270,31 @@ def display_analysis(symbol: str, name: str, source: str, data: TokenData) -> No
         conc_emoji = CONCENTRATION_EMOJI.get(holder_concentration, '⚪')
         top_5_pct = data.get('top_5_pct', 0)
         whale_count = data.get('whale_count', 0)
-        print(f"{conc_emoji} Distribution: {holder_concentration} (Top 5: {top_5_pct:.0f}%, {whale_count} whales)")
+        print(f"{conc_emoji} Distribution: {holder_concentration} (Top 5: {top_5_pct:.0f}%, {whale_count} whales)", file=buf)
 
     # Smart money detection
     smart_money_wallets = data.get('smart_money_wallets', [])
     if smart_money_wallets:
-        print(f"\n💰 SMART MONEY DETECTED:")
+        print(f"\n💰 SMART MONEY DETECTED:", file=buf)
         for wallet in smart_money_wallets:
             tier = wallet['tier']
             tier_emoji_sm = {'S': '🟢', 'A': '🟢', 'B': '🟡', 'C': '🟠'}.get(tier, '⚪')
             win_rate_pct = wallet['win_rate'] * 100
             avg_gain_pct = wallet['avg_gain']
-            print(f"{tier_emoji_sm} Wallet: {wallet['wallet_name']} ({tier}-Tier, {win_rate_pct:.0f}% win rate, avg +{avg_gain_pct:.0f}%)")
+            print(f"{tier_emoji_sm} Wallet: {wallet['wallet_name']} ({tier}-Tier, {win_rate_pct:.0f}% win rate, avg +{avg_gain_pct:.0f}%)", file=buf)
             logger.info(f"Smart money detected: {wallet['wallet_name']} tier={tier}")
 
         if len(smart_money_wallets) > 2:
             others = len(smart_money_wallets) - 2
             if others > 0:
-                print(f"🟡 +{others} other profitable wallet(s) holding")
+                print(f"🟡 +{others} other profitable wallet(s) holding", file=buf)
 
         smart_bonus = data.get('smart_money_bonus', 0)
         if smart_bonus > 0:
-            print(f"✨ Safety score bonus: +{smart_bonus:.1f} points")
+            print(f"✨ Safety score bonus: +{smart_bonus:.1f} points", file=buf)
 
     # Market data
-    print(f"\n📊 MARKET DATA:")
+    print(f"\n📊 MARKET DATA:", file=buf)
 
     # Display liquidity (with pool breakdown if available)
     main_pool_liq = data.get('main_pool_liquidity')
@@ -262,43 +303,43 @@ def display_analysis(symbol: str, name: str, source: str, data: TokenData) -> No
 
     if main_pool_liq and total_liq and main_pool_dex:
         # Show detailed pool breakdown
-        print(f"💧 Main Pool ({main_pool_dex}): {format_currency(main_pool_liq)}")
+        print(f"💧 Main Pool ({main_pool_dex}): {format_currency(main_pool_liq)}", file=buf)
         if total_liq > main_pool_liq:
-            print(f"💧 Total Liquidity: {format_currency(total_liq)}")
+            print(f"💧 Total Liquidity: {format_currency(total_liq)}", file=buf)
     else:
         # Fallback to old format
         liquidity = data.get('liquidity_usd', 0)
-        print(f"💧 Liquidity: {format_currency(liquidity)}")
+        print(f"💧 Liquidity: {format_currency(liquidity)}", file=buf)
 
     holders = data.get('holder_count')
     if holders is not None and holders > 0:
-        print(f"👥 Holders: {holders:,}")
+        print(f"👥 Holders: {holders:,}", file=buf)
     else:
-        print(f"👥 Holders: N/A")
+        print(f"👥 Holders: N/A", file=buf)
 
     token_age = data.get('token_age_hours', 0)
     if token_age >= 24:
-        print(f"⏰ Age: {token_age/24:.1f} days")
+        print(f"⏰ Age: {token_age/24:.1f} days", file=buf)
     else:
-        print(f"⏰ Age: {token_age:.1f} hours")
+        print(f"⏰ Age: {token_age:.1f} hours", file=buf)
 
     volume = data.get('volume_24h', 0)
-    print(f"📈 24h Volume: {format_currency(volume)}")
+    print(f"📈 24h Volume: {format_currency(volume)}", file=buf)
 
     # Volume/Liquidity ratio
     liquidity_val = data.get('liquidity_usd', 0)
     if liquidity_val and liquidity_val > 0 and volume:
         vol_liq = volume / liquidity_val
-        vl_emoji = "🔥" if vol_liq > 2.0 else "📊" if vol_liq > 1.0 else "➡️" if vol_liq > 0.3 else "📉"
-        print(f"{vl_emoji} Vol/Liq Ratio: {vol_liq:.2f}x")
+        vl_emoji = _VOL_LIQ_EMOJI[bisect_left(_VOL_LIQ_BOUNDS, vol_liq)]
+        print(f"{vl_emoji} Vol/Liq Ratio: {vol_liq:.2f}x", file=buf)
 
     market_cap = data.get('market_cap')
     if market_cap:
-        print(f"💰 Market Cap: {format_currency(market_cap)}")
+        print(f"💰 Market Cap: {format_currency(market_cap)}", file=buf)
 
     price = data.get('price_usd')
     if price:
-        print(f"💵 Price: ${price:.10f}")
+        print(f"💵 Price: ${price:.10f}", file=buf)
 
     # Price changes
     price_change_5m = data.get('price_change_5m')
@@ -306,16 +347,13 @@ def display_analysis(symbol: str, name: str, source: str, data: TokenData) -> No
     price_change_24h = data.get('price_change_24h')
 
     if any([price_change_5m, price_change_1h, price_change_24h]):
-        print(f"\n📈 PRICE CHANGES:")
+        print(f"\n📈 PRICE CHANGES:", file=buf)
         if price_change_5m is not None:
-            indicator = "📈" if price_change_5m > 0 else "📉" if price_change_5m < 0 else "➡️"
-            print(f"{indicator} 5m: {price_change_5m:+.2f}%")
+            print(f"{sign_emoji(price_change_5m)} 5m: {price_change_5m:+.2f}%", file=buf)
         if price_change_1h is not None:
-            indicator = "📈" if price_change_1h > 0 else "📉" if price_change_1h < 0 else "➡️"
-            print(f"{indicator} 1h: {price_change_1h:+.2f}%")
+            print(f"{sign_emoji(price_change_1h)} 1h: {price_change_1h:+.2f}%", file=buf)
         if price_change_24h is not None:
-            indicator = "📈" if price_change_24h > 0 else "📉" if price_change_24h < 0 else "➡️"
-            print(f"{indicator} 24h: {price_change_24h:+.2f}%")
+            print(f"{sign_emoji(price_change_24h)} 24h: {price_change_24h:+.2f}%", file=buf)
 
     # Buy/Sell activity
     buy_count = data.get('buy_count_24h')
@@ -323,39 +361,44 @@ def display_analysis(symbol: str, name: str, source: str, data: TokenData) -> No
     if buy_count is not None and sell_count is not None:
         total_txns = buy_count + sell_count
         buy_ratio = (buy_count / total_txns * 100) if total_txns > 0 else 0
-        print(f"\n💱 24H ACTIVITY:")
-        print(f"🟢 Buys: {buy_count} ({buy_ratio:.1f}%)")
-        print(f"🔴 Sells: {sell_count} ({100-buy_ratio:.1f}%)")
+        print(f"\n💱 24H ACTIVITY:", file=buf)
+        print(f"🟢 Buys: {buy_count} ({buy_ratio:.1f}%)", file=buf)
+        print(f"🔴 Sells: {sell_count} ({100-buy_ratio:.1f}%)", file=buf)
 
     # Momentum indicators
     momentum_score = data.get('momentum_score')
     if momentum_score is not None:
-        print(f"\n📊 MOMENTUM ANALYSIS:")
+        print(f"\n📊 MOMENTUM ANALYSIS:", file=buf)
 
         # Overall momentum score
         mom_emoji = "🚀" if momentum_score >= 7 else "📈" if momentum_score >= 5.5 else "📉" if momentum_score < 4 else "➡️"
-        print(f"{mom_emoji} Momentum Score: {momentum_score:.1f}/10")
+        print(f"{mom_emoji} Momentum Score: {momentum_score:.1f}/10", file=buf)
 
         # Buy/sell pressure
         pressure = data.get('buy_sell_pressure', 'NEUTRAL')
         pressure_emoji = PRESSURE_EMOJI.get(pressure, '⚪')
-        print(f"{pressure_emoji} Buy/Sell Pressure: {pressure}")
+        print(f"{pressure_emoji} Buy/Sell Pressure: {pressure}", file=buf)
 
         # Price momentum
         price_mom = data.get('price_momentum', 'NEUTRAL')
         price_emoji = MOMENTUM_EMOJI.get(price_mom, '➡️')
-        print(f"{price_emoji} Price Momentum: {price_mom}")
+        print(f"{price_emoji} Price Momentum: {price_mom}", file=buf)
 
         # Volume trend
         vol_trend = data.get('volume_trend', 'UNKNOWN')
         vol_emoji = VOLUME_EMOJI.get(vol_trend, '❓')
-        print(f"{vol_emoji} Volume Trend: {vol_trend}")
+        print(f"{vol_emoji} Volume Trend: {vol_trend}", file=buf)
 
     # Red flags
     red_flags = data.get('red_flags', [])
     if red_flags:
-        print(f"\n⚠️  RED FLAGS:")
+        print(f"\n⚠️  RED FLAGS:", file=buf)
         for flag in red_flags:
-            print(f"   {flag}")
+            print(f"   {flag}", file=buf)
     else:
-        print(f"\n✅ No major red flags detected!")
+        print(f"\n✅ No major red flags detected!", file=buf)
+
+    report = buf.getvalue()
+    sys.stdout.write(report)
+    sys.stdout.flush()
+    return report
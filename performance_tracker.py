@@ -9,19 +9,86 @@ It will fetch current prices and update the performance_tracking table.
 import time
 import json
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+from bisect import bisect_right
+from collections import deque
+from itertools import islice
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
 from database import MemecoinDatabase
-from data_fetcher import MemecoinDataFetcher
+from data_fetcher import MemecoinDataFetcher, RateLimiter
 from app_logger import tracker_logger, log_performance
+from config import BIRDEYE_RPS
+
+
+# Default for update_token_performance()'s prefetched rows: look them up
+_NOT_LOADED = object()
+
+# Checkpoint reached after N minutes: bisect_right over the bounds picks the
+# label (exactly 15 minutes is already '15m')
+_CHECKPOINT_MINUTES = (15, 60, 240, 1440)
+_CHECKPOINT_LABELS = (None, '15m', '1h', '4h', '24h')
+
+# Price-later columns, filled once when the token first reaches each age
+_PRICE_LATER_COLUMNS = (
+    (15, 'price_15m_later'),
+    (30, 'price_30m_later'),
+    (60, 'price_1h_later'),
+    (1440, 'price_24h_later'),
+    (10080, 'price_7d_later'),
+    (43200, 'price_30d_later'),
+)
+
+# Rug pull thresholds: total liquidity below this many USD, or price below
+# this fraction of the reference price (a 90%+ crash)
+_RUG_LIQUIDITY_USD = 1000.0
+_RUG_PRICE_FRACTION = 0.10
+
+# Price moves smaller than this (in percent) since the latest history row
+# are noise: no new history row unless a checkpoint is crossed or a rug seen
+_PRICE_NOISE_PCT = 0.1
+
+# Tokens still being followed: WATCH decisions and TRADEs without an exit,
+# minus those already recorded as dead.
+# Kept as one constant so the connection's statement cache reuses its plan;
+# get_all_tracked_tokens() appends the optional age cutoff, ORDER BY and LIMIT.
+_TRACKED_TOKENS_SQL = '''
+SELECT
+    c.call_id,
+    c.contract_address,
+    c.token_symbol,
+    c.token_name,
+    c.source,
+    c.blockchain,
+    s.snapshot_timestamp,
+    s.price_usd as call_price,
+    s.market_cap as call_mcap,
+    d.my_decision,
+    d.entry_price as trade_entry_price,
+    d.actual_exit_price
+FROM calls_received c
+JOIN initial_snapshot s ON c.call_id = s.call_id
+JOIN my_decisions d ON c.call_id = d.call_id
+LEFT JOIN performance_tracking p ON c.call_id = p.call_id
+WHERE (
+    d.my_decision = 'WATCH'
+    OR (d.my_decision = 'TRADE' AND (d.actual_exit_price IS NULL OR d.actual_exit_price = 0))
+)
+-- Already confirmed dead: no need to spend an API call re-checking it.
+-- 'no' matches SQLite's TEXT flag and is a boolean literal in Postgres.
+AND (p.token_still_alive IS NULL OR p.token_still_alive <> 'no')
+'''
 
 
 class PerformanceTracker:
     """Tracks token performance over time."""
 
-    # Dead letter queue file for failed requests
-    DEAD_LETTER_FILE = "failed_requests.json"
+    # Dead letter queue for failed requests: one JSON entry per line, appended.
+    # Past DEAD_LETTER_MAX_BYTES the file is rotated to DEAD_LETTER_FILE + '.1'.
+    DEAD_LETTER_FILE = "failed_requests.jsonl"
+    DEAD_LETTER_MAX_BYTES = 1_000_000
+    DEAD_LETTER_KEEP = 1000
     
     def __init__(self, max_workers: int = 3, use_parallel: bool = True):
         """Initialize tracker with database and fetcher.
@@ -34,47 +101,83 @@ class PerformanceTracker:
         self.fetcher = MemecoinDataFetcher()
         self.max_workers = max_workers
         self.use_parallel = use_parallel
+        # Shared by all workers: BIRDEYE_RPS sustained, a second's worth in a burst
+        self.rate_limiter = RateLimiter(BIRDEYE_RPS, burst=int(BIRDEYE_RPS))
+        # While run_update() is running, writes are queued here and flushed
+        # in one batch; None means write straight through
+        self._pending_updates: Optional[List[tuple]] = None
+        self._pending_history: Optional[List[tuple]] = None
+        # Wall-clock time fixed for a whole run_update() pass, so every token's
+        # age is measured against the same instant
+        self._run_now: Optional[datetime] = None
+        # Per-run price lookups keyed by (address, chain): the same coin called
+        # by several sources is fetched once and shared by all its call_ids
+        self._price_lookups: Optional[Dict[tuple, Future]] = None
+        self._price_lookups_lock = threading.Lock()
+        # Parallel workers append to the dead letter file concurrently
+        self._dead_letter_lock = threading.Lock()
+
+    def get_all_tracked_tokens(self, min_age_hours: float = 0, limit: Optional[int] = None):
+        """Get all tokens that need performance tracking (WATCH or open TRADE positions only).
 
-    def get_all_tracked_tokens(self):
-        """Get all tokens that need performance tracking (WATCH or open TRADE positions only)."""
-        self.db.cursor.execute('''
-            SELECT
-                c.call_id,
-                c.contract_address,
-                c.token_symbol,
-                c.token_name,
-                c.source,
-                c.blockchain,
-                s.snapshot_timestamp,
-                s.price_usd as call_price,
-                d.my_decision,
-                d.entry_price as trade_entry_price,
-                d.actual_exit_price
-            FROM calls_received c
-            JOIN initial_snapshot s ON c.call_id = s.call_id
-            JOIN my_decisions d ON c.call_id = d.call_id
-            WHERE (
-                d.my_decision = 'WATCH'
-                OR (d.my_decision = 'TRADE' AND (d.actual_exit_price IS NULL OR d.actual_exit_price = 0))
-            )
-            ORDER BY s.snapshot_timestamp DESC
-        ''')
-        return [dict(row) for row in self.db.cursor.fetchall()]
-
-    def calculate_time_since_snapshot(self, snapshot_timestamp):
-        """Calculate hours since snapshot was taken."""
-        if isinstance(snapshot_timestamp, datetime):
-            snapshot_time = snapshot_timestamp
-        else:
-            snapshot_time = datetime.fromisoformat(str(snapshot_timestamp))
-        if snapshot_time.tzinfo is not None:
-            snapshot_time = snapshot_time.replace(tzinfo=None)
-        now = datetime.now()
+        Args:
+            min_age_hours: Only return tokens whose snapshot is at least this old
+            limit: Return at most this many tokens, most recent first (None = all)
+        """
+        sql = _TRACKED_TOKENS_SQL
+        params = []
+        if min_age_hours > 0:
+            # Naive ISO timestamps compare correctly as SQLite TEXT and as Postgres timestamptz
+            cutoff = (self._run_now or datetime.now()) - timedelta(hours=min_age_hours)
+            sql += 'AND s.snapshot_timestamp <= ?\n'
+            params.append(cutoff.isoformat())
+        sql += 'ORDER BY s.snapshot_timestamp DESC\n'
+        if limit:
+            sql += 'LIMIT ?\n'
+            params.append(limit)
+        tokens = self.db._query(sql, tuple(params))
+        # Parse each timestamp once here rather than on every age check
+        for token in tokens:
+            token['snapshot_timestamp'] = self._parse_timestamp(token['snapshot_timestamp'])
+        return tokens
+
+    @staticmethod
+    def _parse_timestamp(timestamp) -> datetime:
+        """Return a naive datetime for an ISO string or datetime (SQLite or Postgres)."""
+        if not isinstance(timestamp, datetime):
+            timestamp = datetime.fromisoformat(str(timestamp))
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.replace(tzinfo=None)
+        return timestamp
+
+    def calculate_time_since_snapshot(self, snapshot_timestamp, now: Optional[datetime] = None):
+        """Calculate hours since snapshot was taken (as of now, or the run's start)."""
+        snapshot_time = self._parse_timestamp(snapshot_timestamp)
+        now = now or self._run_now or datetime.now()
         delta = now - snapshot_time
         return delta.total_seconds() / 3600  # hours
 
     def fetch_current_price(self, address: str, blockchain: str):
-        """Fetch current price and market cap for a token (Birdeye)."""
+        """Fetch current price and market cap for a token (Birdeye).
+
+        During run_update() each (address, chain) is looked up once; other
+        callers asking for the same token wait for and share that result.
+        """
+        if self._price_lookups is None:
+            return self._fetch_current_price(address, blockchain)
+        key = (address, (blockchain or 'solana').lower())
+        with self._price_lookups_lock:
+            lookup = self._price_lookups.get(key)
+            owner = lookup is None
+            if owner:
+                lookup = self._price_lookups[key] = Future()
+        if owner:
+            lookup.set_result(self._fetch_current_price(address, blockchain))
+        return lookup.result()
+
+    def _fetch_current_price(self, address: str, blockchain: str):
+        """Single Birdeye lookup behind fetch_current_price(); never raises."""
+        self.rate_limiter.acquire()
         try:
             data = self.fetcher.fetch_birdeye_data(address, blockchain=blockchain)
             if data:
@@ -88,9 +191,89 @@ class PerformanceTracker:
             else:
                 return {'price': None, 'liquidity': None, 'total_liquidity': None, 'market_cap': None, 'exists': None}
         except Exception as e:
-            print(f"⚠️  Error fetching price: {e}")
+            tracker_logger.warning("Error fetching price", contract_address=address[:16], error=str(e))
             return {'price': None, 'liquidity': None, 'total_liquidity': None, 'market_cap': None, 'exists': None}
 
+    def prefetch_prices(self, tokens: List[Dict[str, Any]]) -> None:
+        """Look up prices for all tokens in batched requests.
+
+        Birdeye multi_price is asked first and DexScreener's batch endpoint
+        covers whatever it missed. Tokens found get a 'current_data' entry
+        in the same shape as fetch_current_price() returns; the rest are
+        left for a per-token lookup during the update. multi_price carries
+        no market cap, so it is scaled from the call snapshot (memecoin
+        supply is fixed).
+        """
+        by_chain: Dict[str, List[Dict[str, Any]]] = {}
+        for token in tokens:
+            by_chain.setdefault((token.get('blockchain') or 'solana').lower(), []).append(token)
+
+        for blockchain, chain_tokens in by_chain.items():
+            prices = self.fetcher.fetch_birdeye_multi_price(
+                [t['contract_address'] for t in chain_tokens], blockchain,
+                rate_limiter=self.rate_limiter
+            )
+            missing = []
+            for token in chain_tokens:
+                quote = prices.get(token['contract_address'])
+                if not quote:
+                    missing.append(token)
+                    continue
+                price = quote['price_usd']
+                call_price = token.get('call_price')
+                call_mcap = token.get('call_mcap')
+                token['current_data'] = {
+                    'price': price,
+                    'liquidity': quote['liquidity_usd'],
+                    'total_liquidity': quote['liquidity_usd'],
+                    'market_cap': call_mcap * price / call_price if call_mcap and call_price else None,
+                    'exists': True
+                }
+
+            if not missing:
+                continue
+            quotes = self.fetcher.fetch_dexscreener_batch(
+                [t['contract_address'] for t in missing], blockchain
+            )
+            for token in missing:
+                quote = quotes.get(token['contract_address'])
+                if quote:
+                    token['current_data'] = {
+                        'price': quote['price_usd'],
+                        'liquidity': quote['liquidity_usd'],
+                        'total_liquidity': quote['liquidity_usd'],
+                        'market_cap': quote['market_cap'],
+                        'exists': True
+                    }
+
+    def prefetch_rows(self, tokens: List[Dict[str, Any]]) -> None:
+        """Load every token's performance row and latest history row up front.
+
+        Two bulk queries replace the two per-token lookups in
+        update_token_performance(); results go on each token as 'existing'
+        and 'last_history' (None when the call has no row yet).
+        """
+        call_ids = [token['call_id'] for token in tokens]
+        existing = self.db.get_performance_bulk(call_ids)
+        last_history = self.db.get_latest_performance_history_bulk(call_ids)
+        for token in tokens:
+            token['existing'] = existing.get(token['call_id'])
+            token['last_history'] = last_history.get(token['call_id'])
+
+    def _save_performance(self, call_id: int, data: Dict[str, Any]) -> None:
+        """Write a performance update now, or queue it during run_update()."""
+        if self._pending_updates is not None:
+            self._pending_updates.append((call_id, data))
+        else:
+            self.db.insert_or_update_performance(call_id, data)
+
+    def _save_history(self, call_id: int, data: Dict[str, Any]) -> None:
+        """Write a history snapshot now, or queue it during run_update()."""
+        if self._pending_history is not None:
+            self._pending_history.append((call_id, data))
+        else:
+            self.db.insert_performance_history(call_id, data)
+
     def calculate_gain_loss(self, entry_price: float, current_price: float):
         """Calculate percentage gain/loss."""
         if not entry_price or not current_price:
@@ -135,23 +318,40 @@ class PerformanceTracker:
 
     def update_token_performance(self, call_id: int, contract_address: str,
                                 reference_price: Optional[float], snapshot_timestamp: str,
-                                decision_status: str, blockchain: str):
-        """Update performance data for a single token."""
-        hours_since = self.calculate_time_since_snapshot(snapshot_timestamp)
+                                decision_status: str, blockchain: str,
+                                current_data: Optional[Dict[str, Any]] = None,
+                                existing: Any = _NOT_LOADED, last_history: Any = _NOT_LOADED) -> bool:
+        """Update performance data for a single token.
+
+        current_data, when given (see prefetch_prices()), is used instead of
+        fetching the price again. existing and last_history take the call's
+        performance_tracking row and latest history row (None if there is
+        none) as loaded by prefetch_rows(); otherwise they are queried here.
+
+        The performance row is always written, so last_updated and the
+        current values stay fresh; the history row is skipped while the price
+        stays within _PRICE_NOISE_PCT of the latest one.
+
+        Returns:
+            False if the move was noise (no history row written), else True
+        """
+        now = self._run_now or datetime.now()
+        hours_since = self.calculate_time_since_snapshot(snapshot_timestamp, now)
         minutes_since = hours_since * 60
         baseline_price = reference_price if reference_price and reference_price > 0 else None
 
         # Fetch current price
-        print(f"  Checking {contract_address}...")
-        current_data = self.fetch_current_price(contract_address, blockchain)
+        if current_data is None:
+            current_data = self.fetch_current_price(contract_address, blockchain)
 
         if current_data['exists'] is False:
-            print(f"  ❌ Token no longer exists or not found")
-            self.db.insert_or_update_performance(call_id, {
+            tracker_logger.info("Token no longer exists or not found",
+                call_id=call_id, contract_address=contract_address[:16])
+            self._save_performance(call_id, {
                 'token_still_alive': 'no',
                 'rug_pull_occurred': 'yes'
             })
-            self.db.insert_performance_history(call_id, {
+            self._save_history(call_id, {
                 'decision_status': decision_status,
                 'reference_price': baseline_price,
                 'price_usd': None,
@@ -165,13 +365,12 @@ class PerformanceTracker:
                 'token_still_alive': 'no',
                 'rug_pull_occurred': 'yes'
             })
-            return
+            return True
         if current_data['exists'] is None:
-            print(f"  ⚠️  Market data unavailable, recording failure")
             tracker_logger.warning("Birdeye API failed for token",
                 call_id=call_id, contract_address=contract_address[:16])
             # Record the failure in history so we know tracking was attempted
-            self.db.insert_performance_history(call_id, {
+            self._save_history(call_id, {
                 'decision_status': decision_status,
                 'reference_price': baseline_price,
                 'price_usd': None,
@@ -185,7 +384,7 @@ class PerformanceTracker:
                 'token_still_alive': 'unknown',
                 'rug_pull_occurred': None
             })
-            return
+            return True
 
         current_price = current_data['price']
         current_liquidity = current_data['liquidity']
@@ -193,13 +392,12 @@ class PerformanceTracker:
         current_mcap = current_data['market_cap']
 
         if not current_price:
-            print(f"  ⚠️  Could not get current price, recording failure")
             tracker_logger.warning("Birdeye missing price for token",
                 call_id=call_id, contract_address=contract_address[:16])
-            self.db.insert_or_update_performance(call_id, {
+            self._save_performance(call_id, {
                 'token_still_alive': 'unknown',
             })
-            self.db.insert_performance_history(call_id, {
+            self._save_history(call_id, {
                 'decision_status': decision_status,
                 'reference_price': baseline_price,
                 'price_usd': None,
@@ -213,32 +411,17 @@ class PerformanceTracker:
                 'token_still_alive': 'unknown',
                 'rug_pull_occurred': None
             })
-            return
+            return True
 
         # Calculate gain/loss
         gain_loss = self.calculate_gain_loss(baseline_price, current_price)
 
-        if gain_loss is not None:
-            print(f"  📊 Current: ${current_price:.10f} ({gain_loss:+.2f}%)")
-
         # Get existing performance data
-        query = self.db._placeholder()
-        self.db.cursor.execute(
-            f'SELECT * FROM performance_tracking WHERE call_id = {query}',
-            (call_id,)
-        )
-        existing = self.db.cursor.fetchone()
+        if existing is _NOT_LOADED:
+            existing = self.db.get_performance(call_id)
 
         # Determine checkpoint type based on time elapsed
-        checkpoint_type = None
-        if minutes_since >= 1440:  # 24 hours
-            checkpoint_type = '24h'
-        elif minutes_since >= 240:  # 4 hours
-            checkpoint_type = '4h'
-        elif minutes_since >= 60:  # 1 hour
-            checkpoint_type = '1h'
-        elif minutes_since >= 15:  # 15 minutes
-            checkpoint_type = '15m'
+        checkpoint_type = _CHECKPOINT_LABELS[bisect_right(_CHECKPOINT_MINUTES, minutes_since)]
 
         # Prepare update data
         update_data = {
@@ -249,31 +432,24 @@ class PerformanceTracker:
         }
 
         # Determine if this is a rug pull (liquidity dropped significantly or price near zero)
-        if total_liquidity is not None and total_liquidity < 1000:
-            update_data['rug_pull_occurred'] = 'yes'
-            print(f"  🚨 RUG PULL DETECTED - Total Liquidity: ${total_liquidity:.2f}")
-        elif baseline_price and current_price < (baseline_price * 0.10):  # Price dropped 90%+
+        if total_liquidity is not None and total_liquidity < _RUG_LIQUIDITY_USD:
+            rug_reason = 'liquidity drained'
+        elif baseline_price and current_price < baseline_price * _RUG_PRICE_FRACTION:
+            rug_reason = 'price crashed 90%+'
+        else:
+            rug_reason = None
+        if rug_reason:
             update_data['rug_pull_occurred'] = 'yes'
-            print(f"  🚨 RUG PULL SUSPECTED - Price crashed 90%+")
+            tracker_logger.warning("Rug pull detected", call_id=call_id, reason=rug_reason,
+                total_liquidity=total_liquidity, price=current_price, reference_price=baseline_price)
 
         # Update time-based price tracking
-        if minutes_since >= 15 and (not existing or existing.get('price_15m_later') is None):
-            update_data['price_15m_later'] = current_price
-
-        if minutes_since >= 30 and (not existing or existing.get('price_30m_later') is None):
-            update_data['price_30m_later'] = current_price
-
-        if hours_since >= 1 and (not existing or not existing['price_1h_later']):
-            update_data['price_1h_later'] = current_price
-
-        if hours_since >= 24 and (not existing or not existing['price_24h_later']):
-            update_data['price_24h_later'] = current_price
-
-        if hours_since >= 168 and (not existing or not existing['price_7d_later']):  # 7 days
-            update_data['price_7d_later'] = current_price
-
-        if hours_since >= 720 and (not existing or not existing['price_30d_later']):  # 30 days
-            update_data['price_30d_later'] = current_price
+        for minutes, column in _PRICE_LATER_COLUMNS:
+            if minutes_since < minutes:
+                break
+            # is None, not falsiness: a stored 0.0 (typical after a rug) is final
+            if not existing or existing.get(column) is None:
+                update_data[column] = current_price
 
         # Track max and min prices since entry
         seed_price = baseline_price if baseline_price is not None else current_price
@@ -301,7 +477,7 @@ class PerformanceTracker:
                 update_data['max_gain_observed'] = capped_max_gain
                 # Record time to max gain when a new max is hit
                 update_data['time_to_max_gain_hours'] = hours_since
-                update_data['max_gain_timestamp'] = datetime.now().isoformat()
+                update_data['max_gain_timestamp'] = now.isoformat()
 
         if min_gain is not None:
             # Cap at -100% (can't lose more than 100%)
@@ -315,26 +491,28 @@ class PerformanceTracker:
             if not existing or not existing.get('time_to_rug_hours'):
                 update_data['time_to_rug_hours'] = hours_since
 
+        if last_history is _NOT_LOADED:
+            last_history = self.db.get_latest_performance_history(call_id)
+        last_history = last_history or {}
+
         # Save to database
-        self.db.insert_or_update_performance(call_id, update_data)
-
-        # Insert time-series history snapshot
-        last_history = self.db.get_latest_performance_history(call_id)
-        price_change_pct = None
-        liquidity_change_pct = None
-        market_cap_change_pct = None
-        if last_history:
-            last_price = last_history.get('price_usd')
-            last_liq = last_history.get('liquidity_usd')
-            last_mcap = last_history.get('market_cap')
-            if last_price:
-                price_change_pct = ((current_price - last_price) / last_price) * 100
-            if current_liquidity and last_liq:
-                liquidity_change_pct = ((current_liquidity - last_liq) / last_liq) * 100
-            if current_mcap and last_mcap:
-                market_cap_change_pct = ((current_mcap - last_mcap) / last_mcap) * 100
-
-        self.db.insert_performance_history(call_id, {
+        self._save_performance(call_id, update_data)
+
+        # Insert time-series history snapshot, unless the price only moved
+        # by noise and nothing else worth a data point happened
+        price_change_pct = self.calculate_gain_loss(last_history.get('price_usd'), current_price)
+        if (existing and price_change_pct is not None
+                and abs(price_change_pct) < _PRICE_NOISE_PCT
+                and existing.get('checkpoint_type') == checkpoint_type
+                and not rug_reason):
+            tracker_logger.debug("Price within noise since last check",
+                call_id=call_id, price_change_pct=price_change_pct, checkpoint=checkpoint_type)
+            return False
+
+        liquidity_change_pct = self.calculate_gain_loss(last_history.get('liquidity_usd'), current_liquidity)
+        market_cap_change_pct = self.calculate_gain_loss(last_history.get('market_cap'), current_mcap)
+
+        self._save_history(call_id, {
             'decision_status': decision_status,
             'reference_price': baseline_price,
             'price_usd': current_price,
@@ -348,7 +526,9 @@ class PerformanceTracker:
             'token_still_alive': update_data.get('token_still_alive'),
             'rug_pull_occurred': update_data.get('rug_pull_occurred'),
         })
-        print(f"  ✅ Performance updated (checkpoint: {checkpoint_type})")
+        tracker_logger.debug("Performance updated", call_id=call_id, price=current_price,
+            gain_loss_pct=gain_loss, checkpoint=checkpoint_type)
+        return True
 
     def _record_failed_history_snapshot(
         self,
@@ -358,7 +538,7 @@ class PerformanceTracker:
     ) -> None:
         """Record a null history row when a token update fails unexpectedly."""
         try:
-            self.db.insert_performance_history(token.get('call_id'), {
+            self._save_history(token.get('call_id'), {
                 'decision_status': decision_status or 'UNKNOWN',
                 'reference_price': reference_price,
                 'price_usd': None,
@@ -388,14 +568,24 @@ class PerformanceTracker:
             limit: Maximum number of tokens to update (None = all)
             min_age_hours: Only update tokens older than this many hours
         """
-        start_time = time.time()
+        self._run_now = datetime.now()
+        self._price_lookups = {}
+        try:
+            return self._run_update(limit, min_age_hours)
+        finally:
+            self._run_now = None
+            self._price_lookups = None
+
+    def _run_update(self, limit: Optional[int], min_age_hours: float) -> tuple[int, int]:
+        """Body of run_update(), with self._run_now set."""
+        start_time = time.perf_counter()
         tracker_logger.info("Performance tracker started", limit=limit, min_age_hours=min_age_hours)
 
         print("="*60)
         print("📊 PERFORMANCE TRACKER")
         print("="*60)
 
-        tokens = self.get_all_tracked_tokens()
+        tokens = self.get_all_tracked_tokens(min_age_hours=min_age_hours, limit=limit)
 
         if not tokens:
             tracker_logger.warning("No active tokens to track")
@@ -404,51 +594,65 @@ class PerformanceTracker:
             print("💡 PASS decisions and closed trades (with exit recorded) are not tracked.")
             return 0, 0
 
-        # Filter by age if specified
-        if min_age_hours > 0:
-            tokens = [t for t in tokens
-                     if self.calculate_time_since_snapshot(t['snapshot_timestamp']) >= min_age_hours]
-
         tracker_logger.info("Found tokens to update", token_count=len(tokens))
         print(f"\n📋 Found {len(tokens)} active token(s) to update (WATCH or open TRADE positions)")
-
         if limit:
-            tokens = tokens[:limit]
-            print(f"   Limiting to {limit} most recent")
+            print(f"   Limited to {limit} most recent")
 
+        self.prefetch_prices(tokens)
+        self.prefetch_rows(tokens)
         print()
 
         # Track all unique sources for updating stats later
         sources_to_update = set()
-        updated_count = 0
-        error_count = 0
+        updated_count = unchanged_count = error_count = 0
 
-        # Update each token (parallel or sequential)
-        if self.use_parallel and len(tokens) > 1:
-            updated_count, error_count = self._update_tokens_parallel(
-                tokens, sources_to_update
-            )
-        else:
-            updated_count, error_count = self._update_tokens_sequential(
-                tokens, sources_to_update
-            )
+        # Update each token (parallel or sequential), queueing the writes
+        self._pending_updates, self._pending_history = [], []
+        try:
+            if self.use_parallel and len(tokens) > 1:
+                updated_count, unchanged_count, error_count = self._update_tokens_parallel(
+                    tokens, sources_to_update
+                )
+            else:
+                updated_count, unchanged_count, error_count = self._update_tokens_sequential(
+                    tokens, sources_to_update
+                )
+        finally:
+            updates, history = self._pending_updates, self._pending_history
+            self._pending_updates = self._pending_history = None
+
+        print(f"\n💾 Saving {len(updates)} performance update(s) and {len(history)} snapshot(s)...")
+        try:
+            self.db.write_performance_batch(updates, history)
+        except Exception as e:
+            # The whole batch rolled back: record every token it carried
+            tracker_logger.error("Saving queued performance writes failed",
+                updates=len(updates), snapshots=len(history), error=str(e))
+            by_call_id = {token['call_id']: token for token in tokens}
+            for call_id in sorted({call_id for call_id, _ in updates + history}):
+                self._add_to_dead_letter(by_call_id.get(call_id, {'call_id': call_id}),
+                                         f"Batch write failed: {e}")
+            raise
 
         # Update source performance stats for each individual source
         print(f"\n📈 Updating source statistics...")
+        self.db.update_source_performance_bulk(sorted(sources_to_update))
         for source in sorted(sources_to_update):
-            self.db.update_source_performance(source)
             print(f"  ✅ Updated {source}")
 
-        duration_ms = round((time.time() - start_time) * 1000, 2)
+        duration_ms = round((time.perf_counter() - start_time) * 1000, 2)
         tracker_logger.info("Performance tracker completed",
             duration_ms=duration_ms,
             tokens_updated=updated_count,
+            tokens_unchanged=unchanged_count,
             errors=error_count,
             sources_updated=len(sources_to_update)
         )
 
         print("\n" + "="*60)
         print("✅ Performance tracking complete!")
+        print(f"   {updated_count} token(s) updated ({unchanged_count} unchanged), {error_count} failed")
         print("="*60)
         return updated_count, error_count
 
@@ -457,21 +661,19 @@ class PerformanceTracker:
         print("\n📊 TRACKING SUMMARY")
         print("─"*60)
 
-        # Use comparison that works for both SQLite (text 'yes') and Postgres (boolean TRUE)
-        self.db.cursor.execute('''
+        # Use comparison that works for both SQLite (text 'yes') and Postgres (boolean TRUE).
+        # Aggregate performance_tracking on its own; total still counts every call.
+        summary = self.db._query_one('''
             SELECT
-                COUNT(*) as total,
+                (SELECT COUNT(*) FROM calls_received) as total,
                 SUM(CASE WHEN p.token_still_alive = 'yes' OR p.token_still_alive IS TRUE THEN 1 ELSE 0 END) as alive,
                 SUM(CASE WHEN p.rug_pull_occurred = 'yes' OR p.rug_pull_occurred IS TRUE THEN 1 ELSE 0 END) as rugs,
                 AVG(p.max_gain_observed) as avg_gain,
                 MAX(p.max_gain_observed) as best_gain,
                 MIN(p.max_loss_observed) as worst_loss
-            FROM calls_received c
-            LEFT JOIN performance_tracking p ON c.call_id = p.call_id
+            FROM performance_tracking p
         ''')
 
-        summary = dict(self.db.cursor.fetchone())
-
         print(f"Total Tracked: {summary['total']}")
         print(f"Still Alive: {summary['alive'] or 0}")
         print(f"Rug Pulls: {summary['rugs'] or 0}")
@@ -487,10 +689,11 @@ class PerformanceTracker:
         """Update a single token's performance. Used for parallel processing.
         
         Returns:
-            Dict with 'success', 'token', 'sources', and optional 'error' keys
+            Dict with 'success', 'changed', 'token', 'sources', and optional 'error' keys
         """
         result = {
             'success': False,
+            'changed': False,
             'token': token,
             'sources': set(),
             'error': None
@@ -498,14 +701,16 @@ class PerformanceTracker:
         reference_price, _ = self.resolve_reference_price(token)
         
         try:
-            print(f"  Checking {token['token_symbol']} from {token['source']}...")
-            self.update_token_performance(
+            result['changed'] = self.update_token_performance(
                 call_id=token['call_id'],
                 contract_address=token['contract_address'],
                 reference_price=reference_price,
                 snapshot_timestamp=token['snapshot_timestamp'],
                 decision_status=token['my_decision'],
-                blockchain=token['blockchain']
+                blockchain=token['blockchain'],
+                current_data=token.get('current_data'),
+                existing=token.get('existing', _NOT_LOADED),
+                last_history=token.get('last_history', _NOT_LOADED)
             )
             result['success'] = True
             
@@ -528,63 +733,84 @@ class PerformanceTracker:
     
     def _update_tokens_parallel(self, tokens: List[Dict], sources_to_update: set) -> tuple:
         """Update tokens in parallel using ThreadPoolExecutor.
+
+        Workers share rate_limiter, so the request rate matches sequential
+        mode while each lookup's network latency overlaps the others'.
         
         Returns:
-            Tuple of (updated_count, error_count)
+            Tuple of (updated_count, unchanged_count, error_count); unchanged
+            tokens (price within noise, no history row) are also counted as
+            updated
         """
         updated_count = 0
+        unchanged_count = 0
         error_count = 0
         
         print(f"🚀 Using parallel processing with {self.max_workers} workers\n")
         
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all tasks
-            future_to_token = {
-                executor.submit(self._update_single_token, token): token 
-                for token in tokens
+            # Keep at most two tasks per worker in flight instead of queueing
+            # a future for every token up front
+            remaining = iter(tokens)
+            in_flight = {
+                executor.submit(self._update_single_token, token): token
+                for token in islice(remaining, self.max_workers * 2)
             }
-            
-            # Process results as they complete
-            for i, future in enumerate(as_completed(future_to_token), 1):
-                token = future_to_token[future]
-                try:
-                    result = future.result()
-                    if result['success']:
-                        updated_count += 1
-                        sources_to_update.update(result['sources'])
-                        print(f"  ✅ [{i}/{len(tokens)}] {token['token_symbol']} updated")
-                    else:
+            completed = 0
+
+            # Process results as they complete, topping the window back up
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    token = in_flight.pop(future)
+                    completed += 1
+                    try:
+                        result = future.result()
+                        if result['success']:
+                            updated_count += 1
+                            unchanged_count += not result['changed']
+                            sources_to_update.update(result['sources'])
+                        else:
+                            error_count += 1
+                            print(f"  ❌ [{completed}/{len(tokens)}] {token['token_symbol']} failed: {result['error']}")
+                    except Exception as e:
                         error_count += 1
-                        print(f"  ❌ [{i}/{len(tokens)}] {token['token_symbol']} failed: {result['error']}")
-                except Exception as e:
-                    error_count += 1
-                    print(f"  ❌ [{i}/{len(tokens)}] {token['token_symbol']} exception: {e}")
+                        print(f"  ❌ [{completed}/{len(tokens)}] {token['token_symbol']} exception: {e}")
+                    next_token = next(remaining, None)
+                    if next_token is not None:
+                        in_flight[executor.submit(self._update_single_token, next_token)] = next_token
         
-        return updated_count, error_count
+        return updated_count, unchanged_count, error_count
     
     def _update_tokens_sequential(self, tokens: List[Dict], sources_to_update: set) -> tuple:
-        """Update tokens sequentially with rate limiting.
+        """Update tokens one at a time (price lookups still go through rate_limiter).
         
         Returns:
-            Tuple of (updated_count, error_count)
+            Tuple of (updated_count, unchanged_count, error_count); unchanged
+            tokens (price within noise, no history row) are also counted as
+            updated
         """
         updated_count = 0
+        unchanged_count = 0
         error_count = 0
         
-        for i, token in enumerate(tokens, 1):
-            print(f"[{i}/{len(tokens)}] {token['token_symbol']} from {token['source']}")
+        for token in tokens:
             reference_price, _ = self.resolve_reference_price(token)
 
             try:
-                self.update_token_performance(
+                changed = self.update_token_performance(
                     call_id=token['call_id'],
                     contract_address=token['contract_address'],
                     reference_price=reference_price,
                     snapshot_timestamp=token['snapshot_timestamp'],
                     decision_status=token['my_decision'],
-                    blockchain=token['blockchain']
+                    blockchain=token['blockchain'],
+                    current_data=token.get('current_data'),
+                    existing=token.get('existing', _NOT_LOADED),
+                    last_history=token.get('last_history', _NOT_LOADED)
                 )
                 updated_count += 1
+                unchanged_count += not changed
 
                 # Only update source stats for successfully updated tokens
                 source_list = [s.strip() for s in token['source'].split(',') if s.strip()]
@@ -601,11 +827,7 @@ class PerformanceTracker:
                 # Add to dead letter queue
                 self._add_to_dead_letter(token, str(e))
 
-            # Rate limiting to avoid API throttling
-            if i < len(tokens):
-                time.sleep(1.0)  # Wait 1 second between requests
-        
-        return updated_count, error_count
+        return updated_count, unchanged_count, error_count
     
     def _add_to_dead_letter(self, token: Dict[str, Any], error: str) -> None:
         """Add a failed token update to the dead letter queue.
@@ -625,52 +847,58 @@ class PerformanceTracker:
         }
         
         try:
-            # Load existing dead letter queue
-            dead_letters = []
-            if os.path.exists(self.DEAD_LETTER_FILE):
-                with open(self.DEAD_LETTER_FILE, 'r') as f:
-                    dead_letters = json.load(f)
-            
-            # Add new entry
-            dead_letters.append(dead_letter_entry)
-            
-            # Keep only last 1000 entries to prevent file bloat
-            dead_letters = dead_letters[-1000:]
-            
-            # Save back to file
-            with open(self.DEAD_LETTER_FILE, 'w') as f:
-                json.dump(dead_letters, f, indent=2)
-                
+            with self._dead_letter_lock:
+                self._rotate_dead_letter_if_needed()
+                with open(self.DEAD_LETTER_FILE, 'a') as f:
+                    f.write(json.dumps(dead_letter_entry) + '\n')
+
             tracker_logger.warning("Added to dead letter queue",
                 token=token.get('token_symbol'),
                 call_id=token.get('call_id'))
         except Exception as e:
             tracker_logger.error("Failed to write to dead letter queue", error=str(e))
     
+    def _rotate_dead_letter_if_needed(self) -> None:
+        """Move a dead letter file past DEAD_LETTER_MAX_BYTES aside to '.1'."""
+        try:
+            if os.path.getsize(self.DEAD_LETTER_FILE) > self.DEAD_LETTER_MAX_BYTES:
+                os.replace(self.DEAD_LETTER_FILE, self.DEAD_LETTER_FILE + '.1')
+        except FileNotFoundError:
+            pass
+
     def get_dead_letter_queue(self) -> List[Dict[str, Any]]:
-        """Get all entries from the dead letter queue.
+        """Get the most recent entries from the dead letter queue.
         
         Returns:
-            List of dead letter entries
+            Up to DEAD_LETTER_KEEP dead letter entries, oldest first
         """
         if not os.path.exists(self.DEAD_LETTER_FILE):
             return []
         
         try:
             with open(self.DEAD_LETTER_FILE, 'r') as f:
-                return json.load(f)
+                lines = deque(f, maxlen=self.DEAD_LETTER_KEEP)
         except Exception as e:
             tracker_logger.error("Failed to read dead letter queue", error=str(e))
             return []
+
+        entries = []
+        for line in lines:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue  # Skip a line cut short by an interrupted write
+        return entries
     
     def clear_dead_letter_queue(self) -> None:
-        """Clear the dead letter queue."""
-        if os.path.exists(self.DEAD_LETTER_FILE):
-            try:
-                os.remove(self.DEAD_LETTER_FILE)
-                tracker_logger.info("Dead letter queue cleared")
-            except Exception as e:
-                tracker_logger.error("Failed to clear dead letter queue", error=str(e))
+        """Clear the dead letter queue (including any rotated file)."""
+        for path in (self.DEAD_LETTER_FILE, self.DEAD_LETTER_FILE + '.1'):
+            if os.path.exists(path):
+                try:
+                    os.remove(path)
+                    tracker_logger.info("Dead letter queue cleared", file=path)
+                except Exception as e:
+                    tracker_logger.error("Failed to clear dead letter queue", error=str(e))
     
     def check_api_health(self) -> Dict[str, Any]:
         """Check health of all APIs before running updates.
@@ -696,7 +924,8 @@ class PerformanceTracker:
         return health
     
     def close(self):
-        """Close database connection."""
+        """Close HTTP and database connections."""
+        self.fetcher.close()
         self.db.close()
 
 
@@ -723,9 +952,7 @@ def main():
 
     args = parser.parse_args()
 
-    use_parallel = False
-    if not args.sequential:
-        print("⚠️  Parallel mode disabled for reliability; running sequential updates.")
+    use_parallel = not args.sequential
 
     tracker = PerformanceTracker(
         max_workers=args.workers,
@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """
 Fix duplicate sources caused by case sensitivity.
-Normalizes all source names to lowercase.
+Normalizes all source names to lowercase, then installs guards so the
+database refuses non-lowercase names from then on (safe to re-run).
 """
 
 import sqlite3
@@ -10,100 +11,133 @@ import os
 # Get database path (relative to project root, one level up from scripts/)
 db_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'memecoin_analyzer.db')
 
+# calls_received.source is a comma-separated list shared by many calls, so it
+# can't carry a unique index; triggers stand in for CHECK(source = LOWER(source))
+# since SQLite can't add a CHECK constraint to an existing table.
+SOURCE_GUARDS = '''
+CREATE UNIQUE INDEX IF NOT EXISTS idx_srcperf_name_lower
+    ON source_performance(LOWER(source_name));
+
+CREATE TRIGGER IF NOT EXISTS trg_calls_source_lower_insert
+BEFORE INSERT ON calls_received
+WHEN NEW.source <> LOWER(NEW.source)
+BEGIN
+    SELECT RAISE(ABORT, 'calls_received.source must be lowercase');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_calls_source_lower_update
+BEFORE UPDATE OF source ON calls_received
+WHEN NEW.source <> LOWER(NEW.source)
+BEGIN
+    SELECT RAISE(ABORT, 'calls_received.source must be lowercase');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_srcperf_name_lower_insert
+BEFORE INSERT ON source_performance
+WHEN NEW.source_name <> LOWER(NEW.source_name)
+BEGIN
+    SELECT RAISE(ABORT, 'source_performance.source_name must be lowercase');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_srcperf_name_lower_update
+BEFORE UPDATE OF source_name ON source_performance
+WHEN NEW.source_name <> LOWER(NEW.source_name)
+BEGIN
+    SELECT RAISE(ABORT, 'source_performance.source_name must be lowercase');
+END;
+'''
+
 def main():
-    conn = sqlite3.connect(db_path)
+    # Autocommit mode so the explicit BEGIN IMMEDIATE below is the only
+    # transaction: one write lock and one journal sync for the whole fix
+    conn = sqlite3.connect(db_path, isolation_level=None)
     cursor = conn.cursor()
 
     print("="*60)
     print("🔧 FIXING SOURCE NAME DUPLICATES")
     print("="*60)
 
-    # Step 1: Fix calls_received table
-    print("\n📋 Step 1: Checking calls_received table...")
-    cursor.execute("SELECT DISTINCT source FROM calls_received")
-    sources = [row[0] for row in cursor.fetchall()]
-
-    print(f"   Found {len(sources)} unique source entries")
-
-    # Find sources that need normalization
-    calls_updates_needed = []
-    for source in sources:
-        if source and source != source.lower():
-            calls_updates_needed.append((source, source.lower()))
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        # Step 1: Fix calls_received table
+        print("\n📋 Step 1: Checking calls_received table...")
+        cursor.execute("SELECT DISTINCT source FROM calls_received WHERE source <> LOWER(source)")
+        for (source,) in cursor.fetchall():
             print(f"   ❌ '{source}' → '{source.lower()}'")
 
-    if calls_updates_needed:
-        print(f"\n🔄 Normalizing {len(calls_updates_needed)} source(s) in calls_received...")
-        for old_source, new_source in calls_updates_needed:
-            cursor.execute('''
-                UPDATE calls_received
-                SET source = ?
-                WHERE source = ?
-            ''', (new_source, old_source))
-            print(f"   ✅ Updated calls: '{old_source}' → '{new_source}'")
-    else:
-        print("   ✅ All sources in calls_received are already lowercase!")
-
-    # Step 2: Fix source_performance table - check for case-sensitive duplicates
-    print("\n📋 Step 2: Checking source_performance table for duplicates...")
-    cursor.execute("SELECT DISTINCT source_name FROM source_performance")
-    perf_sources = [row[0] for row in cursor.fetchall()]
-
-    print(f"   Found {len(perf_sources)} unique source entries")
-
-    # Group sources by their lowercase version to find duplicates
-    lowercase_groups = {}
-    for source in perf_sources:
-        if source:
-            lower = source.lower()
-            if lower not in lowercase_groups:
-                lowercase_groups[lower] = []
-            lowercase_groups[lower].append(source)
-
-    # Find groups with multiple case variations
-    duplicates_found = []
-    for lower, variants in lowercase_groups.items():
-        if len(variants) > 1:
-            duplicates_found.append((lower, variants))
-            print(f"   ❌ Duplicate: {variants} → '{lower}'")
-
-    if duplicates_found:
-        print(f"\n🔄 Cleaning up {len(duplicates_found)} duplicate source(s)...")
-        for lower, variants in duplicates_found:
-            # Delete ALL variants from source_performance
-            for variant in variants:
-                cursor.execute('''
-                    DELETE FROM source_performance
-                    WHERE source_name = ?
-                ''', (variant,))
-                print(f"   🗑️  Removed: '{variant}'")
-    else:
-        # Still check for uppercase entries even if not duplicates
-        uppercase_found = []
-        for source in perf_sources:
-            if source and source != source.lower():
-                uppercase_found.append(source)
-                print(f"   ❌ Uppercase entry: '{source}' → '{source.lower()}'")
-
-        if uppercase_found:
-            print(f"\n🔄 Cleaning up {len(uppercase_found)} uppercase source(s)...")
-            for source in uppercase_found:
-                cursor.execute('''
-                    DELETE FROM source_performance
-                    WHERE source_name = ?
-                ''', (source,))
-                print(f"   🗑️  Removed: '{source}'")
+        cursor.execute('''
+            UPDATE calls_received
+            SET source = LOWER(source)
+            WHERE source <> LOWER(source)
+        ''')
+        if cursor.rowcount:
+            print(f"   ✅ Normalized {cursor.rowcount} call(s)")
+        else:
+            print("   ✅ All sources in calls_received are already lowercase!")
+
+        # Step 2: Fix source_performance table - check for case-sensitive duplicates
+        print("\n📋 Step 2: Checking source_performance table for duplicates...")
+        cursor.execute('''
+            SELECT LOWER(source_name), GROUP_CONCAT(source_name, ', ')
+            FROM source_performance
+            GROUP BY LOWER(source_name)
+            HAVING COUNT(*) > 1 OR MAX(source_name <> LOWER(source_name))
+        ''')
+        for lower, variants in cursor.fetchall():
+            print(f"   ❌ {variants} → '{lower}'")
+
+        # Stats were computed with lower(c.source) matching, so every case
+        # variant already counts all of the source's calls; summing them
+        # would double-count. Keep one row per source (the lowercase one if
+        # present, else the variant with the most calls) and lowercase it.
+        cursor.execute('''
+            DELETE FROM source_performance
+            WHERE source_name <> LOWER(source_name)
+              AND LOWER(source_name) IN (SELECT source_name FROM source_performance)
+        ''')
+        removed = cursor.rowcount
+        cursor.execute('''
+            DELETE FROM source_performance
+            WHERE source_name <> LOWER(source_name)
+              AND EXISTS (
+                  SELECT 1 FROM source_performance other
+                  WHERE LOWER(other.source_name) = LOWER(source_performance.source_name)
+                    AND other.source_id <> source_performance.source_id
+                    AND (other.total_calls > source_performance.total_calls
+                         OR (other.total_calls = source_performance.total_calls
+                             AND other.source_id < source_performance.source_id))
+              )
+        ''')
+        removed += cursor.rowcount
+        cursor.execute('''
+            UPDATE source_performance
+            SET source_name = LOWER(source_name)
+            WHERE source_name <> LOWER(source_name)
+        ''')
+        renamed = cursor.rowcount
+        if removed or renamed:
+            print(f"   🔀 Removed {removed} variant row(s), lowercased {renamed} source(s)")
         else:
             print("   ✅ No duplicates or uppercase entries in source_performance!")
 
-    conn.commit()
-    conn.close()
+        # Step 3: Stop the duplicates from coming back
+        print("\n📋 Step 3: Installing lowercase guards...")
+        for statement in SOURCE_GUARDS.split(';\n\n'):
+            cursor.execute(statement)
+        print("   ✅ Unique LOWER(source_name) index and lowercase triggers in place")
+
+        cursor.execute("COMMIT")
+    except BaseException:
+        cursor.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
 
     print("\n" + "="*60)
     print("✅ Source names normalized!")
     print("="*60)
     print("\n💡 Now run: python3 performance_tracker.py")
-    print("   This will recalculate stats for all sources.")
+    print("   This will refresh the source stats.")
 
 if __name__ == "__main__":
     main()
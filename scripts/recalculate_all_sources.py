@@ -15,31 +15,17 @@ def main():
 
     db = MemecoinDatabase()
 
-    # Get all unique sources from calls_received (including comma-separated)
-    db.cursor.execute("SELECT DISTINCT source FROM calls_received")
-    all_sources_raw = [row['source'] for row in db.cursor.fetchall()]
-
-    # Split comma-separated sources and create a unique set
-    all_sources = set()
-    for source_str in all_sources_raw:
-        if source_str:
-            # Split by comma and strip whitespace
-            sources = [s.strip() for s in source_str.split(',') if s.strip()]
-            all_sources.update(sources)
+    print("\n🔄 Recalculating statistics for all sources...\n")
 
-    print(f"\n📋 Found {len(all_sources)} unique source(s) in database")
+    # One grouped read + one executemany UPSERT for every source
+    updated = db.recalculate_all_source_performance()
 
-    if not all_sources:
+    if not updated:
         print("\n⚠️  No sources found in database!")
         db.close()
         return
 
-    print("\n🔄 Recalculating statistics for all sources...\n")
-
-    # Update each source
-    for i, source in enumerate(sorted(all_sources), 1):
-        print(f"[{i}/{len(all_sources)}] {source}")
-        db.update_source_performance(source)
+    print(f"📋 Recalculated {updated} unique source(s)")
 
     db.close()
 
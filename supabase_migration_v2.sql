@@ -157,7 +157,6 @@ CREATE TABLE IF NOT EXISTS performance_history (
 -- Foreign key indexes (if not exist)
 CREATE INDEX IF NOT EXISTS idx_initial_snapshot_call_id ON initial_snapshot(call_id);
 CREATE INDEX IF NOT EXISTS idx_my_decisions_call_id ON my_decisions(call_id);
-CREATE INDEX IF NOT EXISTS idx_performance_tracking_call_id ON performance_tracking(call_id);
 CREATE INDEX IF NOT EXISTS idx_performance_history_call_id ON performance_history(call_id);
 
 -- Lookup indexes
@@ -171,6 +170,8 @@ CREATE INDEX IF NOT EXISTS idx_decisions_type ON my_decisions(my_decision);
 -- Performance tracking indexes
 CREATE INDEX IF NOT EXISTS idx_perf_last_updated ON performance_tracking(last_updated DESC);
 CREATE INDEX IF NOT EXISTS idx_performance_history_timestamp ON performance_history(timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_performance_history_call_timestamp ON performance_history(call_id, timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_perf_max_gain ON performance_tracking(max_gain_observed) WHERE max_gain_observed > 0;
 
 -- Timestamp-based indexes for time queries
 CREATE INDEX IF NOT EXISTS idx_calls_timestamp ON calls_received(timestamp_received DESC);
@@ -211,6 +212,15 @@ BEGIN
     END IF;
 END $$;
 
+-- STEP 4b: One performance_tracking row per call (target of the UPSERT)
+-- ================================================
+DELETE FROM performance_tracking
+WHERE tracking_id NOT IN (
+    SELECT MIN(tracking_id) FROM performance_tracking GROUP BY call_id
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_performance_tracking_call_id_unique ON performance_tracking(call_id);
+DROP INDEX IF EXISTS idx_performance_tracking_call_id;
+
 -- STEP 5: Enable useful extensions
 -- ================================================
 CREATE EXTENSION IF NOT EXISTS pg_stat_statements;
@@ -65,7 +65,7 @@ CREATE TABLE IF NOT EXISTS my_decisions (
 -- Table 4: performance_tracking
 CREATE TABLE IF NOT EXISTS performance_tracking (
     tracking_id SERIAL PRIMARY KEY,
-    call_id INTEGER NOT NULL REFERENCES calls_received(call_id),
+    call_id INTEGER NOT NULL UNIQUE REFERENCES calls_received(call_id),
     last_updated TIMESTAMPTZ NOT NULL DEFAULT NOW(),
     price_1h_later REAL,
     price_24h_later REAL,
@@ -135,13 +135,14 @@ CREATE TABLE IF NOT EXISTS tracked_wallets (
 -- Foreign key indexes
 CREATE INDEX IF NOT EXISTS idx_initial_snapshot_call_id ON initial_snapshot(call_id);
 CREATE INDEX IF NOT EXISTS idx_my_decisions_call_id ON my_decisions(call_id);
-CREATE INDEX IF NOT EXISTS idx_performance_tracking_call_id ON performance_tracking(call_id);
 CREATE INDEX IF NOT EXISTS idx_performance_history_call_id ON performance_history(call_id);
 CREATE INDEX IF NOT EXISTS idx_performance_history_timestamp ON performance_history(timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_performance_history_call_timestamp ON performance_history(call_id, timestamp DESC);
 
 -- Lookup indexes
 CREATE INDEX IF NOT EXISTS idx_calls_received_contract ON calls_received(contract_address);
 CREATE INDEX IF NOT EXISTS idx_calls_received_source ON calls_received(source);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_srcperf_name_lower ON source_performance(LOWER(source_name));
 CREATE INDEX IF NOT EXISTS idx_tracked_wallets_address ON tracked_wallets(wallet_address);
 
 -- Decision type index
@@ -151,6 +152,7 @@ CREATE INDEX IF NOT EXISTS idx_decisions_type ON my_decisions(my_decision);
 CREATE INDEX IF NOT EXISTS idx_calls_timestamp ON calls_received(timestamp_received DESC);
 CREATE INDEX IF NOT EXISTS idx_snapshot_timestamp ON initial_snapshot(snapshot_timestamp DESC);
 CREATE INDEX IF NOT EXISTS idx_perf_last_updated ON performance_tracking(last_updated DESC);
+CREATE INDEX IF NOT EXISTS idx_perf_max_gain ON performance_tracking(max_gain_observed) WHERE max_gain_observed > 0;
 
 -- Covering index for tracker joins
 CREATE INDEX IF NOT EXISTS idx_snapshot_covering ON initial_snapshot(call_id, snapshot_timestamp, price_usd);
@@ -3,6 +3,7 @@
 Focused unit tests for core logic that should not depend on live APIs.
 """
 import tempfile
+import threading
 import unittest
 from datetime import datetime, timedelta
 
@@ -141,6 +142,179 @@ class TestCoreLogic(unittest.TestCase):
             self.assertAlmostEqual(sources[0]["avg_max_gain"], 35.0, delta=0.1)
             db.close()
 
+    def test_transaction_groups_writes_and_rolls_back(self):
+        with tempfile.NamedTemporaryFile(suffix=".db") as tmp:
+            db = MemecoinDatabase(db_path=tmp.name)
+            with db.transaction():
+                call_id = db.insert_call("TestTokenTxn", "TX", "Txn", "Test Source", "Solana")
+                # Duplicate insert inside the block must not discard the first row
+                self.assertEqual(db.insert_call("TestTokenTxn", "TX", "Txn", "Test Source", "Solana"), call_id)
+                db.insert_snapshot(call_id, {"price_usd": 1.0})
+                self.assertTrue(db.conn.in_transaction)
+            self.assertFalse(db.conn.in_transaction)
+            self.assertIsNotNone(db.get_call_by_address("TestTokenTxn"))
+
+            with self.assertRaises(RuntimeError):
+                with db.transaction():
+                    db.insert_call("TestTokenTxnRollback", "TR", "Rollback", "Test Source", "Solana")
+                    raise RuntimeError("boom")
+            self.assertIsNone(db.get_call_by_address("TestTokenTxnRollback"))
+            db.close()
+
+    def test_insert_or_update_performance_upsert_keeps_existing_values(self):
+        # Also on SQLite older than 3.35, which has no RETURNING
+        for has_returning in (True, False):
+            with self.subTest(has_returning=has_returning), \
+                    tempfile.NamedTemporaryFile(suffix=".db") as tmp:
+                db = MemecoinDatabase(db_path=tmp.name)
+                db._has_returning = has_returning
+                call_id = db.insert_call("TestTokenUpsert", "UP", "Upsert", "Test Source", "Solana")
+
+                first_id = db.insert_or_update_performance(call_id, {
+                    "price_15m_later": 1.1, "current_mcap": 1000.0, "token_still_alive": "yes",
+                })
+                second_id = db.insert_or_update_performance(call_id, {
+                    "price_1h_later": 1.2, "current_mcap": 2000.0,
+                })
+                self.assertEqual(first_id, second_id)
+
+                db.cursor.execute("SELECT * FROM performance_tracking WHERE call_id = ?", (call_id,))
+                rows = db.cursor.fetchall()
+                self.assertEqual(len(rows), 1)
+                self.assertEqual(rows[0]["tracking_id"], first_id)
+                self.assertEqual(rows[0]["price_15m_later"], 1.1)
+                self.assertEqual(rows[0]["price_1h_later"], 1.2)
+                self.assertEqual(rows[0]["current_mcap"], 2000.0)
+                self.assertEqual(rows[0]["token_still_alive"], "yes")
+                db.close()
+
+    def test_bulk_performance_getters_match_single_lookups(self):
+        with tempfile.NamedTemporaryFile(suffix=".db") as tmp:
+            db = MemecoinDatabase(db_path=tmp.name)
+            tracked = db.insert_call("TestTokenBulkRead1", "R1", "Read1", "alpha", "Solana")
+            untracked = db.insert_call("TestTokenBulkRead2", "R2", "Read2", "alpha", "Solana")
+            db.insert_or_update_performance(tracked, {"max_gain_observed": 50.0})
+            base = datetime(2024, 1, 1)
+            self.addCleanup(setattr, db_module, "_now", db_module._now)
+            for minutes, price in ((0, 1.0), (30, 3.0), (15, 2.0)):
+                db_module._now = lambda: base + timedelta(minutes=minutes)
+                db.insert_performance_history(tracked, {"decision_status": "WATCH", "price_usd": price})
+
+            performance = db.get_performance_bulk([tracked, untracked])
+            history = db.get_latest_performance_history_bulk([tracked, untracked])
+
+            self.assertEqual(list(performance), [tracked])
+            self.assertEqual(performance[tracked], db.get_performance(tracked))
+            self.assertEqual(list(history), [tracked])
+            self.assertEqual(history[tracked], db.get_latest_performance_history(tracked))
+            self.assertEqual(history[tracked]["price_usd"], 3.0)
+            db.close()
+
+    def test_write_performance_batch_matches_single_writes(self):
+        with tempfile.NamedTemporaryFile(suffix=".db") as tmp:
+            db = MemecoinDatabase(db_path=tmp.name)
+            first = db.insert_call("TestTokenBatch1", "W1", "Write1", "alpha", "Solana")
+            second = db.insert_call("TestTokenBatch2", "W2", "Write2", "alpha", "Solana")
+            db.insert_or_update_performance(first, {"price_15m_later": 1.1, "current_mcap": 1000.0})
+
+            db.write_performance_batch(
+                [(first, {"price_1h_later": 1.2, "current_mcap": 2000.0, "token_still_alive": "yes"}),
+                 (second, {"rug_pull_occurred": "yes", "current_mcap": 50.0})],
+                [(first, {"decision_status": "WATCH", "price_usd": 1.2}),
+                 (second, {"decision_status": "TRADE", "price_usd": None, "rug_pull_occurred": "yes"})],
+            )
+
+            performance = db.get_performance_bulk([first, second])
+            self.assertEqual(performance[first]["price_15m_later"], 1.1)
+            self.assertEqual(performance[first]["price_1h_later"], 1.2)
+            self.assertEqual(performance[first]["current_mcap"], 2000.0)
+            self.assertEqual(performance[first]["token_still_alive"], "yes")
+            self.assertEqual(performance[second]["rug_pull_occurred"], "yes")
+            history = db.get_latest_performance_history_bulk([first, second])
+            self.assertEqual(history[first]["price_usd"], 1.2)
+            self.assertEqual(history[second]["decision_status"], "TRADE")
+            db.close()
+
+    def test_update_source_performance_bulk(self):
+        with tempfile.NamedTemporaryFile(suffix=".db") as tmp:
+            db = MemecoinDatabase(db_path=tmp.name)
+            call_id_1 = db.insert_call("TestTokenBulk1", "B1", "Bulk1", "Alpha Calls, Beta Calls", "Solana")
+            call_id_2 = db.insert_call("TestTokenBulk2", "B2", "Bulk2", "Beta Calls", "Solana")
+            db.insert_or_update_performance(call_id_1, {"max_gain_observed": 80.0, "rug_pull_occurred": "no"})
+            db.insert_or_update_performance(call_id_2, {"max_gain_observed": 20.0, "rug_pull_occurred": "yes"})
+
+            db.update_source_performance_bulk(["Alpha Calls", "Beta Calls"])
+
+            sources = {s["source_name"]: s for s in db.get_all_sources()}
+            self.assertEqual(set(sources), {"alpha calls", "beta calls"})
+            self.assertEqual(sources["alpha calls"]["total_calls"], 1)
+            self.assertEqual(sources["beta calls"]["total_calls"], 2)
+            self.assertAlmostEqual(sources["beta calls"]["rug_rate"], 0.5)
+            self.assertFalse(db.conn.in_transaction)
+            db.close()
+
+    def test_update_source_performance_bulk_across_chunks(self):
+        with tempfile.NamedTemporaryFile(suffix=".db") as tmp:
+            db = MemecoinDatabase(db_path=tmp.name)
+            self.addCleanup(setattr, db_module, "_SOURCE_MATCH_CHUNK", db_module._SOURCE_MATCH_CHUNK)
+            db_module._SOURCE_MATCH_CHUNK = 1
+            db.insert_call("TestTokenChunk1", "C1", "Chunk1", "Alpha Calls, Beta Calls", "Solana")
+            db.insert_call("TestTokenChunk2", "C2", "Chunk2", "Beta Calls", "Solana")
+
+            db.update_source_performance_bulk(["Alpha Calls", "Beta Calls", "beta calls"])
+
+            sources = {s["source_name"]: s for s in db.get_all_sources()}
+            self.assertEqual(sources["alpha calls"]["total_calls"], 1)
+            self.assertEqual(sources["beta calls"]["total_calls"], 2)
+            db.close()
+
+    def test_recalculate_all_source_performance_matches_per_source(self):
+        with tempfile.NamedTemporaryFile(suffix=".db") as tmp:
+            db = MemecoinDatabase(db_path=tmp.name)
+            call_id_1 = db.insert_call("TestTokenAll1", "A1", "All1", "Alpha Calls, Beta Calls", "Solana")
+            call_id_2 = db.insert_call("TestTokenAll2", "A2", "All2", "Beta Calls", "Solana")
+            db.insert_or_update_performance(call_id_1, {"max_gain_observed": 80.0, "rug_pull_occurred": "no"})
+            db.insert_or_update_performance(call_id_2, {"max_gain_observed": 20.0, "rug_pull_occurred": "yes"})
+
+            db.update_source_performance_bulk(["Alpha Calls", "Beta Calls"])
+            per_source = {s["source_name"]: s for s in db.get_all_sources()}
+
+            self.assertEqual(db.recalculate_all_source_performance(), 2)
+            recalculated = {s["source_name"]: s for s in db.get_all_sources()}
+
+            for name, row in per_source.items():
+                for key in ("total_calls", "avg_max_gain", "rug_rate", "hit_rate", "median_max_gain", "tier"):
+                    self.assertEqual(recalculated[name][key], row[key], f"{name}.{key}")
+            db.close()
+
+    def test_shared_instance_across_threads(self):
+        with tempfile.NamedTemporaryFile(suffix=".db") as tmp:
+            db = MemecoinDatabase(db_path=tmp.name)
+            errors = []
+
+            def worker(n):
+                try:
+                    for i in range(10):
+                        address = f"TestTokenThread{n}_{i}"
+                        call_id = db.insert_call(address, "TH", "Thread", "Thread Source", "Solana")
+                        db.insert_or_update_performance(call_id, {"max_gain_observed": float(i)})
+                        self.assertEqual(db.get_call_by_address(address)["call_id"], call_id)
+                except Exception as e:  # pragma: no cover - surfaced below
+                    errors.append(e)
+
+            threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+            self.assertEqual(errors, [])
+            db.cursor.execute("SELECT COUNT(*) FROM performance_tracking")
+            self.assertEqual(db.cursor.fetchone()[0], 40)
+            # Reads went through the read-only pool rather than the write connection
+            self.assertTrue(db._read_pool)
+            db.close()
+
     def test_watch_to_trade_exit_flow(self):
         with tempfile.NamedTemporaryFile(suffix=".db") as tmp:
             db = MemecoinDatabase(db_path=tmp.name)
@@ -247,6 +421,149 @@ class TestCoreLogic(unittest.TestCase):
             self.assertAlmostEqual(hrow["gain_loss_pct"], 50.0, delta=0.1)
             tracker.close()
 
+    def test_tracker_skips_history_for_price_noise(self):
+        with tempfile.NamedTemporaryFile(suffix=".db") as tmp:
+            db = MemecoinDatabase(db_path=tmp.name)
+            call_id = db.insert_call("TestTokenUnchanged", "TU", "Unchanged", "alpha", "Solana")
+
+            tracker = PerformanceTracker()
+            tracker.db.close()
+            tracker.db = db
+            current_data = {
+                "price": 1.5,
+                "liquidity": 2000.0,
+                "total_liquidity": 2000.0,
+                "market_cap": 10000.0,
+                "exists": True,
+            }
+            snapshot_ts = (datetime.now() - timedelta(hours=2)).isoformat()
+            changed, liquidity = [], []
+            # The second price is within _PRICE_NOISE_PCT of the first
+            for price, pool in ((1.5, 2000.0), (1.5001, 2100.0), (1.6, 2200.0)):
+                changed.append(tracker.update_token_performance(
+                    call_id=call_id,
+                    contract_address="TestTokenUnchanged",
+                    reference_price=1.0,
+                    snapshot_timestamp=snapshot_ts,
+                    decision_status="WATCH",
+                    blockchain="solana",
+                    current_data=dict(current_data, price=price, liquidity=pool),
+                ))
+                liquidity.append(db.get_performance(call_id)["current_liquidity"])
+
+            self.assertEqual(changed, [True, False, True])
+            # The performance row is still refreshed on a noise-level move
+            self.assertEqual(liquidity, [2000.0, 2100.0, 2200.0])
+            db.cursor.execute(
+                "SELECT price_usd FROM performance_history WHERE call_id = ? ORDER BY history_id", (call_id,)
+            )
+            self.assertEqual([row["price_usd"] for row in db.cursor.fetchall()], [1.5, 1.6])
+            tracker.close()
+
+    def test_parallel_updates_process_every_token(self):
+        tracker = PerformanceTracker(max_workers=2)
+        seen = []
+
+        def fake_update_single_token(token):
+            seen.append(token["call_id"])
+            if token["call_id"] == 3:
+                return {"success": False, "changed": False, "token": token, "sources": set(), "error": "boom"}
+            return {"success": True, "changed": token["call_id"] % 2 == 0, "token": token,
+                    "sources": {"alpha"}, "error": None}
+
+        tracker._update_single_token = fake_update_single_token
+        # More tokens than the in-flight window (two per worker)
+        tokens = [{"call_id": i, "token_symbol": f"T{i}"} for i in range(20)]
+        sources = set()
+        self.assertEqual(tracker._update_tokens_parallel(tokens, sources), (19, 9, 1))
+        self.assertEqual(sorted(seen), list(range(20)))
+        self.assertEqual(sources, {"alpha"})
+        tracker.close()
+
+    def test_tracked_tokens_exclude_dead_tokens(self):
+        with tempfile.NamedTemporaryFile(suffix=".db") as tmp:
+            db = MemecoinDatabase(db_path=tmp.name)
+            call_ids = {}
+            for address, alive in (("TestTokenAlive", "yes"), ("TestTokenDead", "no"), ("TestTokenNew", None)):
+                call_id = db.insert_call(address, address[-4:], address, "alpha", "Solana")
+                db.insert_snapshot(call_id, {"price_usd": 1.0, "market_cap": 1000.0})
+                db.insert_decision(
+                    call_id=call_id,
+                    decision="WATCH",
+                    trade_size_usd=None,
+                    entry_price=1.0,
+                    reasoning_notes="watch",
+                    emotional_state="calm",
+                    confidence_level=5,
+                )
+                if alive is not None:
+                    db.insert_or_update_performance(call_id, {"token_still_alive": alive})
+                call_ids[address] = call_id
+
+            tracker = PerformanceTracker()
+            tracker.db.close()
+            tracker.db = db
+            tracked = {token["call_id"] for token in tracker.get_all_tracked_tokens()}
+            self.assertEqual(tracked, {call_ids["TestTokenAlive"], call_ids["TestTokenNew"]})
+            tracker.close()
+
+    def test_tracked_tokens_age_cutoff_and_limit(self):
+        with tempfile.NamedTemporaryFile(suffix=".db") as tmp:
+            db = MemecoinDatabase(db_path=tmp.name)
+            self.addCleanup(setattr, db_module, "_now", db_module._now)
+            call_ids = {}
+            for hours_old in (1, 5, 10):
+                db_module._now = lambda h=hours_old: datetime.now() - timedelta(hours=h)
+                call_id = db.insert_call(f"TestTokenAge{hours_old}", "AGE", "Age", "alpha", "Solana")
+                db.insert_snapshot(call_id, {"price_usd": 1.0})
+                db.insert_decision(
+                    call_id=call_id,
+                    decision="WATCH",
+                    trade_size_usd=None,
+                    entry_price=1.0,
+                    reasoning_notes="watch",
+                    emotional_state="calm",
+                    confidence_level=5,
+                )
+                call_ids[hours_old] = call_id
+
+            tracker = PerformanceTracker()
+            tracker.db.close()
+            tracker.db = db
+            old_enough = [t["call_id"] for t in tracker.get_all_tracked_tokens(min_age_hours=4)]
+            self.assertEqual(old_enough, [call_ids[5], call_ids[10]])
+            most_recent = [t["call_id"] for t in tracker.get_all_tracked_tokens(min_age_hours=4, limit=1)]
+            self.assertEqual(most_recent, [call_ids[5]])
+            tracker.close()
+
+    def test_tracker_fetches_shared_contract_once_per_run(self):
+        with tempfile.NamedTemporaryFile(suffix=".db") as tmp:
+            tracker = PerformanceTracker()
+            tracker.db.close()
+            tracker.db = MemecoinDatabase(db_path=tmp.name)
+            fetched = []
+
+            def fake_fetch_birdeye_data(address, blockchain="solana"):
+                fetched.append((address, blockchain))
+                return {"price_usd": 2.0, "liquidity_usd": 5000.0, "market_cap": 20000.0}
+
+            tracker.fetcher.fetch_birdeye_data = fake_fetch_birdeye_data
+            tracker._price_lookups = {}
+            results = []
+            threads = [
+                threading.Thread(target=lambda: results.append(tracker.fetch_current_price("TestTokenShared", "Solana")))
+                for _ in range(4)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            tracker.fetch_current_price("TestTokenOther", "solana")
+
+            self.assertEqual(fetched, [("TestTokenShared", "Solana"), ("TestTokenOther", "solana")])
+            self.assertEqual([r["price"] for r in results], [2.0] * 4)
+            tracker.close()
+
     def test_tracker_rug_detection_by_liquidity(self):
         with tempfile.NamedTemporaryFile(suffix=".db") as tmp:
             db = MemecoinDatabase(db_path=tmp.name)
@@ -7,6 +7,7 @@ from unittest.mock import Mock, patch, MagicMock
 import tempfile
 import os
 import sys
+import time
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -44,7 +45,7 @@ class TestAPIErrorHandling(unittest.TestCase):
         self.assertTrue(is_transient_error(Exception("Connection timeout")))
         self.assertTrue(is_transient_error(Exception("Service unavailable")))
 
-    @patch('data_fetcher.requests.get')
+    @patch('data_fetcher.requests.Session.get')
     def test_birdeye_all_retries_fail(self, mock_get):
         """Test when Birdeye fails after all retries."""
         mock_get.side_effect = TimeoutError("Connection timeout")
@@ -56,7 +57,7 @@ class TestAPIErrorHandling(unittest.TestCase):
         # Should have attempted retries
         self.assertGreater(mock_get.call_count, 0)
 
-    @patch('data_fetcher.requests.get')
+    @patch('data_fetcher.requests.Session.get')
     def test_birdeye_fallback_to_dexscreener(self, mock_get):
         """Test fallback to DexScreener when Birdeye fails."""
         # First calls fail (Birdeye)
@@ -84,6 +85,56 @@ class TestAPIErrorHandling(unittest.TestCase):
         self.assertIsNotNone(result)
         self.assertEqual(result['data_source'], 'DexScreener')
 
+    @patch('data_fetcher.BIRDEYE_API_KEY', 'test-key')
+    @patch('data_fetcher.requests.Session.get')
+    def test_birdeye_multi_price_skips_failed_chunk(self, mock_get):
+        """A failed multi_price chunk leaves its addresses to per-token lookups."""
+        self.fetcher.BIRDEYE_MULTI_PRICE_CHUNK = 2
+        mock_get.side_effect = [
+            Mock(status_code=200, json=Mock(return_value={
+                "success": True,
+                "data": {
+                    "addr_a": {"value": 1.5, "liquidity": 2000},
+                    "addr_b": None,
+                }
+            })),
+            ServerError("Birdeye 500", "Birdeye", 500),
+        ]
+
+        limiter = Mock()
+
+        result = self.fetcher.fetch_birdeye_multi_price(["addr_c", "addr_b", "addr_a"],
+                                                        rate_limiter=limiter)
+
+        self.assertEqual(result, {"addr_a": {"price_usd": 1.5, "liquidity_usd": 2000.0}})
+        # Addresses go out sorted, in chunks, each taking a rate limiter slot
+        self.assertEqual(mock_get.call_args_list[0].kwargs['params']['list_address'], "addr_a,addr_b")
+        self.assertEqual(limiter.acquire.call_count, 2)
+        # The transient failure trips the circuit breaker like a per-token lookup
+        self.assertEqual(self.fetcher._birdeye_consecutive_failures, 1)
+        self.assertGreater(self.fetcher._birdeye_disabled_until, time.time())
+
+    @patch('data_fetcher.requests.Session.get')
+    def test_dexscreener_batch_picks_deepest_pair(self, mock_get):
+        """Batched DexScreener lookups keep each token's highest-liquidity pair on the chain."""
+        self.fetcher.DEXSCREENER_BATCH_CHUNK = 2
+        mock_get.side_effect = [
+            Mock(status_code=200, json=Mock(return_value={"pairs": [
+                {"chainId": "solana", "baseToken": {"address": "addr_a"},
+                 "priceUsd": "1.0", "liquidity": {"usd": 500}, "fdv": 9000},
+                {"chainId": "solana", "baseToken": {"address": "addr_a"},
+                 "priceUsd": "1.1", "liquidity": {"usd": 8000}, "fdv": 10000},
+                {"chainId": "base", "baseToken": {"address": "addr_b"},
+                 "priceUsd": "3.0", "liquidity": {"usd": 9000}, "fdv": 1},
+            ]})),
+            ServerError("DexScreener 500", "DexScreener", 500),
+        ]
+
+        result = self.fetcher.fetch_dexscreener_batch(["addr_c", "addr_b", "addr_a"])
+
+        self.assertEqual(result, {"addr_a": {"price_usd": 1.1, "liquidity_usd": 8000.0, "market_cap": 10000.0}})
+        self.assertTrue(mock_get.call_args_list[0].args[0].endswith("/addr_a,addr_b"))
+
     def test_invalid_blockchain_handling(self):
         """Test handling of invalid blockchain parameter."""
         # Should default to solana for unknown chains
@@ -247,6 +298,48 @@ class TestPerformanceTrackerErrorHandling(unittest.TestCase):
         dead_letters = self.tracker.get_dead_letter_queue()
         self.assertLessEqual(len(dead_letters), 1000)
 
+    def test_dead_letter_queue_rotates_large_file(self):
+        """A dead letter file past the size cap is moved aside before the next append."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.tracker.DEAD_LETTER_FILE = os.path.join(tmp_dir, 'failed_requests.jsonl')
+            self.tracker.DEAD_LETTER_MAX_BYTES = 500
+            for i in range(10):
+                self.tracker._add_to_dead_letter({'call_id': i, 'token_symbol': f'TOKEN{i}'}, f"Error {i}")
+
+            self.assertTrue(os.path.exists(self.tracker.DEAD_LETTER_FILE + '.1'))
+            recent = self.tracker.get_dead_letter_queue()
+            self.assertEqual(recent[-1]['call_id'], 9)
+            self.assertLess(len(recent), 10)
+
+            self.tracker.clear_dead_letter_queue()
+            self.assertEqual(os.listdir(tmp_dir), [])
+
+    def test_failed_batch_write_goes_to_dead_letter_queue(self):
+        """If the end-of-run flush fails, every queued token is dead-lettered."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.tracker.DEAD_LETTER_FILE = os.path.join(tmp_dir, 'failed_requests.jsonl')
+            tokens = [{'call_id': i, 'token_symbol': f'TOKEN{i}'} for i in (1, 2)]
+            self.tracker.get_all_tracked_tokens = Mock(return_value=tokens)
+            self.tracker.prefetch_prices = Mock()
+            self.tracker.prefetch_rows = Mock()
+
+            def queue_writes(tokens, sources):
+                for token in tokens:
+                    self.tracker._save_performance(token['call_id'], {})
+                    self.tracker._save_history(token['call_id'], {})
+                return len(tokens), 0, 0
+
+            self.tracker._update_tokens_sequential = queue_writes
+            self.tracker.db.write_performance_batch = Mock(side_effect=RuntimeError("db down"))
+
+            with self.assertRaises(RuntimeError):
+                self.tracker.run_update()
+
+            entries = self.tracker.get_dead_letter_queue()
+            self.assertEqual([entry['call_id'] for entry in entries], [1, 2])
+            self.assertEqual(entries[0]['token_symbol'], 'TOKEN1')
+            self.assertIn("db down", entries[0]['error'])
+
     def test_empty_token_list_handling(self):
         """Test handling of empty token list."""
         # Mock get_all_tracked_tokens to return empty list
@@ -403,6 +496,38 @@ class TestCachingBehavior(unittest.TestCase):
         cleaned = cache.cleanup_expired()
         self.assertEqual(cleaned, 5)
 
+    def test_cache_maxsize_evicts_oldest(self):
+        """Test that a full cache drops its oldest entry first."""
+        from data_fetcher import TTLCache
+
+        cache = TTLCache(ttl_seconds=60, maxsize=2)
+        cache.set("a", {"data": 1})
+        cache.set("b", {"data": 2})
+        cache.set("a", {"data": 3})  # refresh moves "a" to the newest end
+        cache.set("c", {"data": 4})
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), {"data": 3})
+        self.assertEqual(cache.get("c"), {"data": 4})
+
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Test the shared token-bucket rate limiter."""
+
+    @patch('data_fetcher.time.sleep')
+    @patch('data_fetcher.time.monotonic', return_value=100.0)
+    def test_burst_then_paced(self, _mock_monotonic, mock_sleep):
+        """Test that a full bucket allows a burst, then paces at the rate."""
+        from data_fetcher import RateLimiter
+
+        limiter = RateLimiter(rate_per_second=2, burst=3)
+        for _ in range(5):
+            limiter.acquire()
+
+        waits = [call.args[0] for call in mock_sleep.call_args_list]
+        self.assertEqual(waits, [0.5, 1.0])
+
 
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
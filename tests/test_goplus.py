@@ -48,7 +48,7 @@ class TestGoPlusSecurityAPI(unittest.TestCase):
         expected = f"https://api.gopluslabs.io/api/v1/token_security/{chain_id}?contract_addresses={self.evm_address}"
         self.assertEqual(url, expected)
 
-    @patch('data_fetcher.requests.get')
+    @patch('data_fetcher.requests.Session.get')
     def test_fetch_security_data_solana_success(self, mock_get):
         """Test successful Solana security data fetch."""
         # Mock response for Solana
@@ -76,7 +76,7 @@ class TestGoPlusSecurityAPI(unittest.TestCase):
         self.assertEqual(result['top_holder_percent'], 5.5)
         self.assertEqual(len(result['top_holders']), 2)
 
-    @patch('data_fetcher.requests.get')
+    @patch('data_fetcher.requests.Session.get')
     def test_fetch_security_data_evm_success(self, mock_get):
         """Test successful EVM security data fetch."""
         # Mock response for EVM (Base)
@@ -111,7 +111,7 @@ class TestGoPlusSecurityAPI(unittest.TestCase):
         self.assertEqual(result['sell_tax'], 5.0)
         self.assertEqual(result['holder_count'], 1500)
 
-    @patch('data_fetcher.requests.get')
+    @patch('data_fetcher.requests.Session.get')
     def test_fetch_security_data_rate_limit(self, mock_get):
         """Test rate limit handling."""
         mock_response = Mock()
@@ -122,7 +122,7 @@ class TestGoPlusSecurityAPI(unittest.TestCase):
         result = self.fetcher.fetch_security_data(self.solana_address, blockchain='solana')
         self.assertIsNone(result)  # Should return None after retries
 
-    @patch('data_fetcher.requests.get')
+    @patch('data_fetcher.requests.Session.get')
     def test_fetch_security_data_timeout(self, mock_get):
         """Test timeout handling."""
         from data_fetcher import requests as df_requests
@@ -131,7 +131,7 @@ class TestGoPlusSecurityAPI(unittest.TestCase):
         result = self.fetcher.fetch_security_data(self.solana_address, blockchain='solana')
         self.assertIsNone(result)
 
-    @patch('data_fetcher.requests.get')
+    @patch('data_fetcher.requests.Session.get')
     def test_fetch_security_data_empty_result(self, mock_get):
         """Test handling of empty result."""
         mock_response = Mock()
@@ -142,7 +142,7 @@ class TestGoPlusSecurityAPI(unittest.TestCase):
         result = self.fetcher.fetch_security_data(self.solana_address, blockchain='solana')
         self.assertIsNone(result)
 
-    @patch('data_fetcher.requests.get')
+    @patch('data_fetcher.requests.Session.get')
     def test_fetch_security_data_invalid_json(self, mock_get):
         """Test handling of invalid JSON response."""
         mock_response = Mock()
@@ -194,7 +194,7 @@ class TestGoPlusSecurityAPI(unittest.TestCase):
             security_score += 1000
         return security_score
 
-    @patch('data_fetcher.requests.get')
+    @patch('data_fetcher.requests.Session.get')
     def test_fetch_security_data_all_chains(self, mock_get):
         """Test that security data can be fetched for all supported chains."""
         mock_response = Mock()
@@ -245,7 +245,7 @@ class TestGoPlusCaching(unittest.TestCase):
         self.fetcher = MemecoinDataFetcher()
         self.fetcher._api_cache.clear()  # Clear cache before each test
 
-    @patch('data_fetcher.requests.get')
+    @patch('data_fetcher.requests.Session.get')
     def test_caching_reduces_api_calls(self, mock_get):
         """Test that caching reduces the number of API calls."""
         mock_response = Mock()
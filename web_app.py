@@ -213,54 +213,52 @@ def update_decision(call_id):
         except Exception:
             pass
 
-        if decision == 'TRADE' and current_decision != 'TRADE':
-            # Use current market price for trade entry, not call price.
-            new_entry_price = checkpoint_price or call_price
-            entry_timestamp = datetime.now().isoformat()
-            db._execute('''
-                UPDATE my_decisions
-                SET my_decision = ?, reasoning_notes = ?, entry_price = ?, entry_timestamp = ?
-                WHERE call_id = ?
-            ''', (decision, notes, new_entry_price, entry_timestamp, call_id))
-            trade_entry_price = new_entry_price
-        else:
-            db._execute('''
-                UPDATE my_decisions
-                SET my_decision = ?, reasoning_notes = ?
-                WHERE call_id = ?
-            ''', (decision, notes, call_id))
-
-        # Record a decision-transition checkpoint so history is continuous
-        # up to the moment of PASS or TRADE conversion.
-        if decision != current_decision:
-            reference_price = trade_entry_price if decision == 'TRADE' else call_price
-            gain_loss = None
-            if checkpoint_price and reference_price:
-                gain_loss = ((checkpoint_price - reference_price) / reference_price) * 100
-
-            db.insert_performance_history(call_id, {
-                'decision_status': decision,
-                'reference_price': reference_price,
-                'price_usd': checkpoint_price,
-                'liquidity_usd': checkpoint_liquidity,
-                'total_liquidity': checkpoint_total_liquidity,
-                'market_cap': checkpoint_mcap,
-                'gain_loss_pct': gain_loss,
-                'price_change_pct': None,
-                'liquidity_change_pct': None,
-                'market_cap_change_pct': None,
-                'token_still_alive': 'yes' if checkpoint_price else 'unknown',
-                'rug_pull_occurred': None
-            })
-
-        # Commit both the decision update and history insert atomically.
-        db.conn.commit()
+        # The decision update and history insert commit together, or the
+        # rollback undoes both
+        with db.transaction():
+            if decision == 'TRADE' and current_decision != 'TRADE':
+                # Use current market price for trade entry, not call price.
+                new_entry_price = checkpoint_price or call_price
+                entry_timestamp = datetime.now().isoformat()
+                db._execute('''
+                    UPDATE my_decisions
+                    SET my_decision = ?, reasoning_notes = ?, entry_price = ?, entry_timestamp = ?
+                    WHERE call_id = ?
+                ''', (decision, notes, new_entry_price, entry_timestamp, call_id))
+                trade_entry_price = new_entry_price
+            else:
+                db._execute('''
+                    UPDATE my_decisions
+                    SET my_decision = ?, reasoning_notes = ?
+                    WHERE call_id = ?
+                ''', (decision, notes, call_id))
+
+            # Record a decision-transition checkpoint so history is continuous
+            # up to the moment of PASS or TRADE conversion.
+            if decision != current_decision:
+                reference_price = trade_entry_price if decision == 'TRADE' else call_price
+                gain_loss = None
+                if checkpoint_price and reference_price:
+                    gain_loss = ((checkpoint_price - reference_price) / reference_price) * 100
+
+                db.insert_performance_history(call_id, {
+                    'decision_status': decision,
+                    'reference_price': reference_price,
+                    'price_usd': checkpoint_price,
+                    'liquidity_usd': checkpoint_liquidity,
+                    'total_liquidity': checkpoint_total_liquidity,
+                    'market_cap': checkpoint_mcap,
+                    'gain_loss_pct': gain_loss,
+                    'price_change_pct': None,
+                    'liquidity_change_pct': None,
+                    'market_cap_change_pct': None,
+                    'token_still_alive': 'yes' if checkpoint_price else 'unknown',
+                    'rug_pull_occurred': None
+                })
 
         flash(f'Decision updated to {decision}', 'success')
 
     except Exception as e:
-        # Rollback undoes both the decision change AND the history insert.
-        db.conn.rollback()
         flash(f'Error updating decision: {str(e)}', 'error')
 
     return redirect(url_for('token_detail', call_id=call_id))
@@ -304,7 +302,7 @@ def refresh_token(call_id):
 
 def get_watchlist_tokens(db):
     """Get all tokens on watchlist with their latest data."""
-    db.cursor.execute('''
+    rows = db._query('''
         SELECT
             c.call_id,
             c.contract_address,
@@ -332,7 +330,6 @@ def get_watchlist_tokens(db):
         ORDER BY s.snapshot_timestamp DESC
     ''')
 
-    rows = db.cursor.fetchall()
     tokens = []
     for row in rows:
         token = dict(row)
@@ -358,8 +355,7 @@ def get_watchlist_tokens(db):
 
 def get_token_by_id(db, call_id):
     """Get token data by call_id."""
-    query = db._placeholder()
-    db.cursor.execute(f'''
+    return db._query_one('''
         SELECT
             c.*,
             s.*,
@@ -373,36 +369,25 @@ def get_token_by_id(db, call_id):
         FROM calls_received c
         JOIN initial_snapshot s ON c.call_id = s.call_id
         JOIN my_decisions d ON c.call_id = d.call_id
-        WHERE c.call_id = {query}
+        WHERE c.call_id = ?
     ''', (call_id,))
 
-    row = db.cursor.fetchone()
-    return dict(row) if row else None
-
 
 def get_token_performance(db, call_id):
     """Get performance data for a token."""
-    query = db._placeholder()
-    db.cursor.execute(f'''
-        SELECT * FROM performance_tracking WHERE call_id = {query}
+    return db._query_one('''
+        SELECT * FROM performance_tracking WHERE call_id = ?
     ''', (call_id,))
 
-    row = db.cursor.fetchone()
-    return dict(row) if row else None
-
 
 def get_performance_history(db, call_id):
     """Get performance history for a token."""
-    query = db._placeholder()
-    db.cursor.execute(f'''
+    return db._query('''
         SELECT * FROM performance_history
-        WHERE call_id = {query}
+        WHERE call_id = ?
         ORDER BY timestamp DESC
     ''', (call_id,))
 
-    rows = db.cursor.fetchall()
-    return [dict(row) for row in rows]
-
 
 def format_time_ago(dt):
     """Format datetime as 'X minutes/hours/days ago'."""